@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+import tkinter as tk
+from pathlib import Path
+from tkinter import font as tkfont
+
+from storage import atomic_write_text
+
+FONT_FAMILY = "Segoe UI"
+MONO_FAMILY = "Courier New"
+# (tamaño, estilo) de todos los textos de la interfaz: se crean al arrancar
+PRELOADED_FONTS = (
+    (9, "bold"), (10, "bold"), (12, "bold"), (13, "bold"), (14, "bold"), (14, "underline"), (15, "normal"), (15, "bold"), (16, "bold"),
+    (18, "bold"), (20, "bold"), (36, "bold"), (38, "bold"), (40, "bold"), (42, "bold"),
+)
+# Colores más repetidos de menús y partida
+PALETTE = (
+    "#0f172a", "#e2e8f0", "#111827", "#cbd5e1", "#f59e0b", "#22c55e", "#fbbf24", "#a78bfa", "#93c5fd", "#334155", "#0b1120", "#facc15",
+    "#f8fafc", "#60a5fa", "#fca5a5", "#ef4444", "#92400e", "#64748b", "#1f2937", "#052e16", "#020617", "#84cc16", "#3f6212", "#14532d",
+)
+
+ATLAS_IMAGE = "cactus_atlas.png"
+ATLAS_MANIFEST = "cactus_atlas.json"
+MANIFEST_VERSION = 1
+
+
+class AssetManager:
+    # Recursos compartidos de la ventana. Las fuentes son objetos Font con nombre: Tk las
+    # resuelve una vez y cada create_text solo pasa el nombre, en vez de una tupla que
+    # hay que volver a interpretar. Los colores de PALETTE quedan reservados en un canvas
+    # oculto (Tk libera un color cuando ningún item lo usa y lo vuelve a buscar después).
+    def __init__(self, root: tk.Misc, assets_dir: Path) -> None:
+        self.root = root
+        self.assets_dir = assets_dir
+        self.fonts: dict[tuple[str, int, str], tkfont.Font] = {}
+        for size, style in PRELOADED_FONTS:
+            self.font(size, style)
+        self.palette_canvas = tk.Canvas(root, width=1, height=1)
+        for color in PALETTE:
+            self.palette_canvas.create_rectangle(0, 0, 1, 1, fill=color, outline=color)
+        self.cactus_sizes: list[tuple[int, int]] = []
+
+    def font(self, size: int, style: str = "bold", family: str = FONT_FAMILY) -> tkfont.Font:
+        key = (family, size, style)
+        cached = self.fonts.get(key)
+        if cached is None:
+            cached = tkfont.Font(self.root, family=family, size=size, weight="bold" if style == "bold" else "normal", underline=style == "underline")
+            self.fonts[key] = cached
+        return cached
+
+    def load_cactus(self) -> list[tuple[int, int]]:
+        # El juego dibuja los cactus con formas: solo necesita sus tamaños. Con el
+        # manifiesto al día no se abre ninguna imagen; sin él, los PNG sueltos.
+        manifest = read_manifest(self.assets_dir)
+        if manifest is not None:
+            self.cactus_sizes = [(sprite["w"], sprite["h"]) for sprite in manifest["sprites"]]
+            return self.cactus_sizes
+        for image_path in cactus_sources(self.assets_dir):
+            try:
+                image = tk.PhotoImage(file=str(image_path))
+            except tk.TclError:
+                continue
+            self.cactus_sizes.append((image.width(), image.height()))
+        return self.cactus_sizes
+
+
+def cactus_sources(assets_dir: Path) -> list[Path]:
+    folder = assets_dir / "cactus"
+    return sorted(folder.glob("*.png")) if folder.is_dir() else []
+
+
+def manifest_is_stale(manifest_path: Path, cactus_dir: Path) -> bool:
+    # Añadir, quitar o renombrar un PNG cambia la fecha de la carpeta: así se sabe si
+    # hay que reempaquetar con dos stat, sin listar la carpeta en cada arranque
+    try:
+        return cactus_dir.stat().st_mtime > manifest_path.stat().st_mtime
+    except OSError:
+        return True
+
+
+def read_manifest(assets_dir: Path) -> dict | None:
+    manifest_path = assets_dir / ATLAS_MANIFEST
+    if manifest_is_stale(manifest_path, assets_dir / "cactus"):
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION or not isinstance(manifest.get("sprites"), list):
+        return None
+    return manifest
+
+
+def pack_cactus_atlas(root: tk.Misc, assets_dir: Path) -> int:
+    # Una fila con todos los sprites: son pocos y de alturas parecidas
+    images = [(path.name, tk.PhotoImage(master=root, file=str(path))) for path in cactus_sources(assets_dir)]
+    if not images:
+        return 0
+    width = sum(image.width() for _name, image in images)
+    height = max(image.height() for _name, image in images)
+    atlas = tk.PhotoImage(master=root, width=width, height=height)
+    sprites = []
+    x = 0
+    for name, image in images:
+        atlas.tk.call(atlas, "copy", image, "-to", x, 0)
+        sprites.append({"name": name, "x": x, "y": 0, "w": image.width(), "h": image.height()})
+        x += image.width()
+    atlas.write(str(assets_dir / ATLAS_IMAGE), format="png")
+    manifest = {"version": MANIFEST_VERSION, "image": ATLAS_IMAGE, "width": width, "height": height, "sprites": sprites}
+    atomic_write_text(assets_dir / ATLAS_MANIFEST, json.dumps(manifest, indent=2) + "\n")
+    return len(sprites)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Empaqueta assets/cactus/*.png en un atlas con manifiesto de tamaños")
+    parser.add_argument("--assets", type=Path, default=Path(__file__).with_name("assets"))
+    args = parser.parse_args(argv)
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        count = pack_cactus_atlas(root, args.assets)
+    finally:
+        root.destroy()
+    print(f"{count} sprites en {args.assets / ATLAS_IMAGE}" if count else f"No hay PNG en {args.assets / 'cactus'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
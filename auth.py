@@ -0,0 +1,108 @@
+import hashlib
+import hmac
+import queue
+import secrets
+import threading
+from collections.abc import Callable
+
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 200_000
+
+
+def hash_password(password: str) -> str:
+    salt = secrets.token_bytes(16)
+    # scrypt si el OpenSSL de Python lo trae; si no, PBKDF2-SHA256
+    if hasattr(hashlib, "scrypt"):
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, maxmem=64 * 1024 * 1024)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def is_password_hash(stored: str) -> bool:
+    return stored.startswith(("scrypt$", "pbkdf2_sha256$"))
+
+
+def verify_password(password: str, stored: str) -> tuple[bool, str | None]:
+    # Devuelve (correcta, hash nuevo). El hash nuevo solo viene cuando la cuenta aún
+    # guardaba la contraseña en claro y hay que actualizarla tras este login.
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            digest = hashlib.scrypt(password.encode("utf-8"), salt=bytes.fromhex(parts[4]), n=n, r=r, p=p, maxmem=64 * 1024 * 1024)
+            return hmac.compare_digest(digest.hex(), parts[5]), None
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), bytes.fromhex(parts[2]), int(parts[1]))
+            return hmac.compare_digest(digest.hex(), parts[3]), None
+    except (ValueError, AttributeError):
+        return False, None
+    if hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8")):
+        return True, hash_password(password)
+    return False, None
+
+
+class SessionCache:
+    # Logins ya verificados en este proceso. No guarda la contraseña: solo un HMAC con
+    # una clave aleatoria del proceso y el hash contra el que se comprobó (si la
+    # contraseña cambia, el hash guardado cambia y la sesión deja de valer).
+    def __init__(self) -> None:
+        self.key = secrets.token_bytes(32)
+        self.sessions: dict[str, tuple[bytes, str]] = {}
+
+    def tag(self, password: str) -> bytes:
+        return hmac.new(self.key, password.encode("utf-8"), hashlib.sha256).digest()
+
+    def remember(self, username: str, password: str, stored: str) -> None:
+        self.sessions[username] = (self.tag(password), stored)
+
+    def check(self, username: str, password: str, stored: str) -> bool:
+        session = self.sessions.get(username)
+        return session is not None and session[1] == stored and hmac.compare_digest(session[0], self.tag(password))
+
+
+class AuthWorker:
+    # Hilo para el hash de contraseñas. Los resultados se aplican en el hilo de Tk
+    # desde poll(), que el bucle principal llama en cada tick (after). Si un trabajo (o
+    # su callback) falla, se llama a on_error con la excepción y el hilo sigue vivo; si
+    # falla también on_error, poll() devuelve la excepción.
+    def __init__(self) -> None:
+        self.jobs: queue.SimpleQueue[tuple[Callable, tuple, Callable, Callable]] = queue.SimpleQueue()
+        self.results: queue.SimpleQueue[tuple[Callable, Callable, object]] = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="auth-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, func: Callable, args: tuple, callback: Callable[[object], None], on_error: Callable[[Exception], None]) -> None:
+        self.jobs.put((func, args, callback, on_error))
+
+    def run(self) -> None:
+        while True:
+            func, args, callback, on_error = self.jobs.get()
+            try:
+                result = func(*args)
+            except Exception as exc:
+                self.results.put((on_error, on_error, exc))
+            else:
+                self.results.put((callback, on_error, result))
+
+    def poll(self) -> list[Exception]:
+        # Nunca deja escapar una excepción al bucle de Tk: lo que falle también en
+        # on_error se devuelve para que quien llama lo muestre en pantalla.
+        unhandled: list[Exception] = []
+        while True:
+            try:
+                callback, on_error, result = self.results.get_nowait()
+            except queue.Empty:
+                return unhandled
+            try:
+                callback(result)
+            except Exception as exc:
+                if callback is on_error:
+                    unhandled.append(exc)
+                    continue
+                try:
+                    on_error(exc)
+                except Exception as error_exc:
+                    unhandled.append(error_exc)
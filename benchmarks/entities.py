@@ -0,0 +1,130 @@
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from simulation import KIND_BIRD, KIND_CACTUS, Bird, Coin, Lane, Obstacle
+
+# Caja fija del jugador para el test de solape (fuera de la trayectoria, no hay muertes)
+PLAYER_BOX = (106.0, -200.0, 152.0, -156.0)
+
+
+def run_dicts(steps: int, spawn_every: int, burst: int) -> tuple[float, int]:
+    # Camino anterior: dicts con claves de texto, float() en cada acceso y listas nuevas cada paso
+    px1, py1, px2, py2 = PLAYER_BOX
+    obstacles: list[dict[str, object]] = []
+    coins: list[dict[str, float]] = []
+    speed = 8.0
+    start = time.perf_counter()
+    for step in range(steps):
+        if step % spawn_every == 0:
+            kind = "bird" if step % (2 * spawn_every) == 0 else "cactus"
+            for i in range(burst):
+                obstacles.append({"type": kind, "x": 1300.0 + 3 * i, "y": 380.0, "w": 40.0, "h": 50.0, "image": None})
+                coins.append({"x": 1310.0 + 3 * i, "y": 330.0, "r": 22.0})
+        for obs in obstacles:
+            obs["x"] = float(obs["x"]) - speed * (1.25 if obs["type"] == "bird" else 1.0)
+            ox1 = float(obs["x"])
+            oy1 = float(obs["y"])
+            if px1 < ox1 + float(obs["w"]) and px2 > ox1 and py1 < oy1 + float(obs["h"]) and py2 > oy1:
+                pass
+        new_coins: list[dict[str, float]] = []
+        for coin in coins:
+            coin["x"] -= speed * 1.05
+            if coin["x"] + coin["r"] * 2 > -40:
+                new_coins.append(coin)
+        coins = new_coins
+        obstacles = [obs for obs in obstacles if float(obs["x"]) + float(obs["w"]) > -50]
+    return time.perf_counter() - start, len(obstacles) + len(coins)
+
+
+def run_numpy(steps: int, spawn_every: int, burst: int) -> tuple[float, int]:
+    # Columnas NumPy (struct-of-arrays) con operaciones por lotes: mover, probar el
+    # solape y quitar lo que sale son operaciones sobre la columna entera, sin bucle
+    # Python por entidad. Filas: x, y, w, h y factor de velocidad.
+    px1, py1, px2, py2 = PLAYER_BOX
+    stores = [[np.zeros((5, 256)), 0, -50.0], [np.zeros((5, 256)), 0, -40.0]]
+    obstacles, coins = stores
+    offsets = np.arange(burst) * 3.0
+    speed = 8.0
+    start = time.perf_counter()
+    for step in range(steps):
+        if step % spawn_every == 0:
+            bird_factor = 1.25 if step % (2 * spawn_every) == 0 else 1.0
+            for store, row in ((obstacles, (1300.0, 380.0, 40.0, 50.0, bird_factor)), (coins, (1310.0, 330.0, 44.0, 44.0, 1.05))):
+                cols, count, _limit = store
+                if count + burst > cols.shape[1]:
+                    cols = store[0] = np.concatenate((cols, np.zeros_like(cols)), axis=1)
+                cols[:, count:count + burst] = np.array(row)[:, None]
+                cols[0, count:count + burst] += offsets
+                store[1] = count + burst
+        for store in stores:
+            cols, count, limit = store
+            x = cols[0, :count]
+            x -= speed * cols[4, :count]
+            if store is obstacles:
+                y = cols[1, :count]
+                if ((x < px2) & (x + cols[2, :count] > px1) & (y < py2) & (y + cols[3, :count] > py1)).any():
+                    pass
+            keep = x + cols[2, :count] > limit
+            if not keep.all():
+                alive = int(keep.sum())
+                cols[:, :alive] = cols[:, :count][:, keep]
+                store[1] = alive
+    return time.perf_counter() - start, obstacles[1] + coins[1]
+
+
+def run_pool(steps: int, spawn_every: int, burst: int) -> tuple[float, int]:
+    # Camino actual: objetos con __slots__ reutilizados desde la lista libre de cada Lane
+    px1, py1, px2, py2 = PLAYER_BOX
+    lanes = {KIND_CACTUS: Lane(Obstacle, 1.0, -50), KIND_BIRD: Lane(Bird, 1.25, -50)}
+    coins = Lane(Coin, 1.05, -40)
+    speed = 8.0
+    start = time.perf_counter()
+    for step in range(steps):
+        if step % spawn_every == 0:
+            lane = lanes[KIND_BIRD if step % (2 * spawn_every) == 0 else KIND_CACTUS]
+            for i in range(burst):
+                lane.spawn().place(step, lane, 1300.0 + 3 * i, 380.0, 40.0, 50.0, -1)
+                coins.spawn().place_coin(step, coins, 1310.0 + 3 * i, 330.0, 22.0)
+        for lane in (lanes[KIND_CACTUS], lanes[KIND_BIRD], coins):
+            lane.advance(speed)
+        for lane in (lanes[KIND_CACTUS], lanes[KIND_BIRD]):
+            offset = lane.offset
+            for obs in lane.entities:
+                x = obs.anchor - offset
+                if x >= px2:
+                    break
+                if x + obs.w > px1 and py1 < obs.y + obs.h and py2 > obs.y:
+                    pass
+        for lane in (lanes[KIND_CACTUS], lanes[KIND_BIRD], coins):
+            lane.cull()
+    return time.perf_counter() - start, sum(len(lane) for lane in (*lanes.values(), coins))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark: entidades en dicts, en columnas NumPy y en objetos __slots__ con pool y fase amplia")
+    parser.add_argument("--steps", type=int, default=20_000)
+    parser.add_argument("--spawn-every", type=int, nargs="+", default=[50, 10, 2], help="pasos entre apariciones (menos = más entidades vivas)")
+    parser.add_argument("--burst", type=int, nargs="+", default=[1, 10, 50], help="entidades por aparición (modos de estrés)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if np is None:
+        print("NumPy no está instalado: se omite la variante de columnas")
+
+    for burst in args.burst:
+        for spawn_every in args.spawn_every:
+            dict_s, live = min(run_dicts(args.steps, spawn_every, burst) for _ in range(args.repeat))
+            pool_s, _ = min(run_pool(args.steps, spawn_every, burst) for _ in range(args.repeat))
+            line = f"burst={burst:<3} spawn_every={spawn_every:<4} vivas={live:<6} dicts: {dict_s / args.steps * 1e6:8.2f} us/paso  pool: {pool_s / args.steps * 1e6:8.2f} us/paso"
+            if np is not None:
+                numpy_s, _ = min(run_numpy(args.steps, spawn_every, burst) for _ in range(args.repeat))
+                line += f"  numpy: {numpy_s / args.steps * 1e6:8.2f} us/paso"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
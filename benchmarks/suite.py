@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from quality import TIERS
+from simulation import GameSimulation
+from storage import JsonAccountStore, ShardedAccountStore, SqliteAccountStore, atomic_write_text
+
+# Milisegundos entre apariciones forzadas; None deja el recorrido normal del juego
+DENSITIES = {"normal": None, "media": 300, "alta": 60}
+CACTUS_SIZES = [(40, 60), (56, 48), (30, 70)]
+ACCOUNT_COUNTS = (10, 1_000, 100_000)
+QUICK_ACCOUNT_COUNTS = (10, 1_000)
+SCREENS = ("login", "register_account", "recover_password", "main_menu", "shop", "skins_menu", "leaderboard", "pause_menu", "game_over_menu")
+
+
+def result(value: float, unit: str, higher_is_better: bool, **extra: object) -> dict[str, object]:
+    return {"value": round(value, 6), "unit": unit, "higher_is_better": higher_is_better, **extra}
+
+
+def best_of(repeat: int, func) -> float:
+    return min(func() for _ in range(repeat))
+
+
+def bench_simulation(steps: int, repeat: int) -> dict[str, dict[str, object]]:
+    # El núcleo de update(): GameSimulation.step sin Tk. Al morir se sigue con las mismas
+    # entidades para medir siempre con la densidad pedida.
+    results = {}
+    for name, spawn_ms in DENSITIES.items():
+        live = 0
+
+        def run() -> float:
+            nonlocal live
+            sim = GameSimulation(1248, 600, CACTUS_SIZES)
+            if spawn_ms is not None:
+                sim.spawn_min = sim.spawn_max = sim.coin_spawn_min = sim.coin_spawn_max = spawn_ms
+            sim.reset(seed=1234)
+            live = 0
+            start = time.perf_counter()
+            for step in range(steps):
+                sim.step(1 if step % 40 == 0 else 0)
+                if not sim.running:
+                    sim.running = True
+                live += len(sim.cacti) + len(sim.birds) + len(sim.coins)
+            return time.perf_counter() - start
+
+        elapsed = best_of(repeat, run)
+        results[f"sim.step.{name}"] = result(steps / elapsed, "pasos/s", True, entities=round(live / steps, 1))
+    return results
+
+
+def bench_collision(calls: int, repeat: int) -> dict[str, dict[str, object]]:
+    sim = GameSimulation(1248, 600, CACTUS_SIZES)
+    sim.reset(seed=99)
+    rng = random.Random(7)
+    obstacles = []
+    coins = []
+    for _ in range(64):
+        obstacles.append(sim.cacti.spawn().place(sim.new_entity_id(), sim.cacti, rng.uniform(0, 400), sim.ground_y - 50, 40, 50, -1))
+        coins.append(sim.coins.spawn().place_coin(sim.new_entity_id(), sim.coins, rng.uniform(0, 400), sim.ground_y - rng.choice((44, 70, 120)), 22))
+    rounds = max(1, calls // len(obstacles))
+
+    def run(check, entities) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for entity in entities:
+                check(entity)
+        return time.perf_counter() - start
+
+    total = rounds * len(obstacles)
+    return {
+        "sim.collide": result(total / best_of(repeat, lambda: run(sim.collide, obstacles)), "llamadas/s", True),
+        "sim.collect_coin": result(total / best_of(repeat, lambda: run(sim.collect_coin, coins)), "llamadas/s", True),
+    }
+
+
+def synthetic_accounts(count: int) -> dict[str, dict[str, object]]:
+    rng = random.Random(count)
+    return {
+        f"user{i}": {
+            "password": "scrypt$16384$8$1$" + "ab" * 16 + "$" + "cd" * 64,
+            "email": f"user{i}@example.com",
+            "emilianos": rng.randrange(500),
+            "best_score": rng.randrange(5000),
+            "equipped_skin": "default",
+            "owned_skins": ["default"],
+        }
+        for i in range(count)
+    }
+
+
+def bench_storage(counts: tuple[int, ...], saves: int) -> dict[str, dict[str, object]]:
+    # Abrir el almacén (carga) y guardar el progreso de un jugador hasta que está en disco
+    results = {}
+    for count in counts:
+        accounts = synthetic_accounts(count)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            legacy = root / "accounts_data.json"
+            atomic_write_text(legacy, json.dumps(accounts))
+            stores = {
+                "json": lambda: JsonAccountStore(legacy),
+                "sqlite": lambda: SqliteAccountStore(root / "accounts.db", legacy),
+                "sharded": lambda: ShardedAccountStore(root / "profiles", legacy),
+            }
+            for kind, open_store in stores.items():
+                open_store().close()  # migración fuera de la medida
+                start = time.perf_counter()
+                store = open_store()
+                load_ms = (time.perf_counter() - start) * 1000.0
+                save_total = 0.0
+                for i in range(saves):
+                    username = f"user{i % count}"
+                    start = time.perf_counter()
+                    info = store[username]
+                    info["emilianos"] = int(info["emilianos"]) + 2
+                    store[username] = info
+                    writer = getattr(store, "writer", None)
+                    if writer is not None:
+                        writer.flush()
+                    save_total += time.perf_counter() - start
+                store.close()
+                results[f"storage.{kind}.load.{count}"] = result(load_ms, "ms", False)
+                results[f"storage.{kind}.save.{count}"] = result(save_total / saves * 1000.0, "ms", False)
+    return results
+
+
+def bench_draw(frames: int) -> dict[str, dict[str, object]]:
+    # Necesita Tk y un display; en CI: xvfb-run -a python -m benchmarks.suite --only draw
+    try:
+        import tkinter as tk
+
+        import main
+    except ImportError as exc:
+        return {"draw": {"skipped": f"sin tkinter: {exc}"}}
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        return {"draw": {"skipped": f"sin display: {exc}"}}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cuentas, ranking y grabaciones en un directorio temporal, no en el del juego
+        main.ROOT_DIR = tmp
+        main.LEADERBOARD_PATH = os.path.join(tmp, "leaderboard.json")
+        main.REPLAYS_DIR = os.path.join(tmp, "replays")
+        # Nivel de calidad fijo: el ajuste automático cambiaría la escena a mitad de medida
+        app = main.DinoRunner(root, quality="alta")
+        app.current_user = "bench"
+        root.update()
+        for screen in SCREENS:
+            app.screen = screen
+            total = 0.0
+            for _ in range(frames):
+                # Cada frame repinta el menú entero (el peor caso: algo lo invalida)
+                app.invalidate()
+                start = time.perf_counter()
+                app.draw()
+                root.update_idletasks()
+                total += time.perf_counter() - start
+            results[f"draw.{screen}"] = result(total / frames * 1000.0, "ms/frame", False)
+
+        for tier in TIERS:
+            app.quality.pin(tier)
+            for name, score in (("dia", 0), ("noche", 750)):
+                app.rebuild_scene()
+                app.screen = "playing"
+                app.reset_run(reset_record=False)
+                app.sim.score = score
+                total = 0.0
+                for step in range(frames):
+                    app.sim.step(1 if step % 40 == 0 else 0)
+                    app.sim.running = True
+                    start = time.perf_counter()
+                    app.draw()
+                    root.update_idletasks()
+                    total += time.perf_counter() - start
+                results[f"draw.playing.{name}" + ("" if tier == TIERS[0] else f".{tier}")] = result(total / frames * 1000.0, "ms/frame", False, items=len(app.canvas.find_all()))
+        app.accounts.close()
+    root.destroy()
+    return results
+
+
+def compare(current: dict[str, dict[str, object]], baseline: dict[str, dict[str, object]], threshold: float) -> int:
+    regressions = 0
+    print(f"{'prueba':<34}{'base':>14}{'ahora':>14}{'cambio':>9}")
+    for key, now in current.items():
+        before = baseline.get(key)
+        if not before or "value" not in now or "value" not in before or not before["value"]:
+            continue
+        change = (now["value"] - before["value"]) / before["value"]
+        worse = -change if now["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESIÓN"
+            regressions += 1
+        print(f"{key:<34}{before['value']:>14.3f}{now['value']:>14.3f}{change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de simulación, render y guardado (resultados en JSON)")
+    parser.add_argument("--only", nargs="+", choices=["sim", "collide", "storage", "draw"], default=["sim", "collide", "storage", "draw"])
+    parser.add_argument("--quick", action="store_true", help="menos pasos y sin el caso de 100k cuentas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="fichero JSON donde guardar los resultados")
+    parser.add_argument("--compare", type=Path, help="JSON de referencia: marca las pruebas que empeoran más que --threshold")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    steps = 20_000 if args.quick else 100_000
+    results: dict[str, dict[str, object]] = {}
+    if "sim" in args.only:
+        results.update(bench_simulation(steps, args.repeat))
+    if "collide" in args.only:
+        results.update(bench_collision(steps * 5, args.repeat))
+    if "storage" in args.only:
+        results.update(bench_storage(QUICK_ACCOUNT_COUNTS if args.quick else ACCOUNT_COUNTS, 50 if args.quick else 200))
+    if "draw" in args.only:
+        results.update(bench_draw(60 if args.quick else 300))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        return 1 if compare(results, baseline.get("results", {}), args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from simulation import EVENT_DEATH, INPUT_CROUCH, INPUT_JUMP, KIND_BIRD, SIM_HZ, GameSimulation
+
+ASSETS_DIR = Path(__file__).with_name("assets")
+CACTUS_ASSETS_DIR = ASSETS_DIR / "cactus"
+# Manifiesto del atlas de cactus (asset_manager.py): los tamaños sin abrir ninguna imagen
+ATLAS_MANIFEST = ASSETS_DIR / "cactus_atlas.json"
+PLAYFIELD = (1248, 600)
+CHUNK_RUNS = 250
+
+
+def png_size(path: Path) -> tuple[int, int] | None:
+    # Ancho y alto desde la cabecera IHDR, sin cargar la imagen (los workers no usan Tk)
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def cactus_sizes() -> list[tuple[int, int]]:
+    # Igual que el juego: se confía en el manifiesto salvo que falte o la carpeta de
+    # PNG sea más nueva que él (se añadió o quitó alguno desde que se empaquetó)
+    try:
+        if CACTUS_ASSETS_DIR.stat().st_mtime <= ATLAS_MANIFEST.stat().st_mtime:
+            sprites = json.loads(ATLAS_MANIFEST.read_text(encoding="utf-8"))["sprites"]
+            return [(sprite["w"], sprite["h"]) for sprite in sprites]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    sources = sorted(CACTUS_ASSETS_DIR.glob("*.png")) if CACTUS_ASSETS_DIR.is_dir() else []
+    return [size for size in (png_size(path) for path in sources) if size]
+
+
+class Policy:
+    # Salta cuando el siguiente cactus está a menos de `reaction` pasos de tocar al
+    # jugador. "humana" saca una reacción distinta para cada cactus; "perfecta" usa
+    # siempre la media; "aleatoria" salta al azar. A los pájaros no se les salta:
+    # de pie no alcanzan al jugador, solo en el aire.
+    def __init__(self, kind: str, rng: random.Random, reaction: float, spread: float) -> None:
+        self.kind = kind
+        self.rng = rng
+        self.reaction = reaction
+        self.spread = spread
+        self.target: object = None
+        self.trigger = reaction
+
+    def __call__(self, sim: GameSimulation) -> int:
+        if self.kind == "aleatoria":
+            return INPUT_JUMP if self.rng.random() < 0.04 else 0
+        if not sim.grounded:
+            return 0
+        px1 = sim.player_x
+        px2 = px1 + sim.player_w
+        offset = sim.cacti.offset
+        for obs in sim.cacti.entities:
+            x = obs.anchor - offset
+            if x + obs.w < px1:
+                continue
+            if obs is not self.target:
+                self.target = obs
+                self.trigger = self.reaction if self.kind == "perfecta" else self.rng.gauss(self.reaction, self.spread)
+            # speed va en px por frame de 20 ms: la reacción es tiempo, no pasos de simulación.
+            # Se decide una vez por paso, así que de media se salta medio paso tarde; se
+            # corrige para que esa media sea la de 50 Hz y --sim-hz no cambie la dificultad.
+            if x - px2 < (self.trigger + (sim.tick_scale - 1.0) / 2) * sim.speed:
+                return INPUT_JUMP
+            break
+        # Agacharse con un pájaro bajo encima no cambia nada de pie, pero es lo que haría un jugador
+        offset = sim.birds.offset
+        for bird in sim.birds.entities:
+            x = bird.anchor - offset
+            if x + bird.w >= px1:
+                return INPUT_CROUCH if x - px2 < 2 * sim.speed and sim.ground_y - bird.y < 100 else 0
+        return 0
+
+
+def run_chunk(task: tuple) -> list[tuple[int, int, int, str]]:
+    # Trabajo de un proceso: cada partida tiene su semilla (semilla base, índice), así que
+    # el resultado no depende de cuántos procesos haya ni de cómo se repartan.
+    seed, first, count, params, policy_kind, reaction, spread, max_steps, sizes, tick_hz = task
+    results = []
+    for index in range(first, first + count):
+        game_seed = (seed << 32) | index
+        sim = GameSimulation(*PLAYFIELD, sizes, tick_hz=tick_hz)
+        for name, value in params.items():
+            setattr(sim, name, value)
+        sim.reset(seed=game_seed)
+        policy = Policy(policy_kind, random.Random(game_seed ^ 0x5DEECE66D), reaction, spread)
+        coins = 0
+        cause = "tiempo"
+        while sim.steps < max_steps:
+            events = sim.step(policy(sim))
+            coins += sim.step_coins
+            if events & EVENT_DEATH:
+                killer = sim.killed_by
+                cause = f"pájaro_{round(sim.ground_y - killer.y)}" if killer.kind == KIND_BIRD else "cactus"
+                break
+        results.append((sim.steps, sim.score, coins, cause))
+    return results
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return {"media": sum(ordered) / len(ordered), "p10": pick(0.10), "p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": ordered[-1]}
+
+
+def summarize(results: list[tuple[int, int, int, str]], tick_hz: int) -> dict[str, object]:
+    seconds = [steps / tick_hz for steps, _score, _coins, _cause in results]
+    causes = Counter(cause for *_rest, cause in results)
+    return {
+        "partidas": len(results),
+        "supervivencia_s": percentiles(seconds),
+        "puntuacion": percentiles([score for _steps, score, _coins, _cause in results]),
+        "monedas": percentiles([coins for _steps, _score, coins, _cause in results]),
+        "causa_muerte": {cause: round(count / len(results), 4) for cause, count in causes.most_common()},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluador Monte Carlo de dificultad: miles de partidas sin ventana en varios procesos")
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--policy", choices=["humana", "perfecta", "aleatoria"], default="humana")
+    parser.add_argument("--reaction", type=float, default=10.0, help="antelación con que se salta un cactus, en frames de 20 ms")
+    parser.add_argument("--spread", type=float, default=3.0, help="desviación de la reacción en la política humana")
+    parser.add_argument("--max-seconds", type=float, default=600.0, help="tope de duración de cada partida")
+    parser.add_argument("--spawn-min", type=int)
+    parser.add_argument("--spawn-max", type=int)
+    parser.add_argument("--bird-threshold", type=int, help="puntuación a partir de la que salen pájaros")
+    parser.add_argument("--coin-chance", type=float)
+    parser.add_argument("--speed-ramp", type=float, help="aumento de velocidad por paso")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="pasos de simulación por segundo (el resultado debería ser el mismo con cualquiera)")
+    parser.add_argument("--json", type=Path, help="guardar el resumen en este fichero")
+    args = parser.parse_args()
+
+    params = {
+        name: value
+        for name, value in (
+            ("spawn_min", args.spawn_min),
+            ("spawn_max", args.spawn_max),
+            ("bird_score_threshold", args.bird_threshold),
+            ("coin_spawn_chance", args.coin_chance),
+            ("speed_ramp", args.speed_ramp),
+        )
+        if value is not None
+    }
+    max_steps = int(args.max_seconds * args.sim_hz)
+    sizes = cactus_sizes()
+    tasks = [
+        (args.seed, first, min(CHUNK_RUNS, args.runs - first), params, args.policy, args.reaction, args.spread, max_steps, sizes, args.sim_hz)
+        for first in range(0, args.runs, CHUNK_RUNS)
+    ]
+
+    start = time.perf_counter()
+    results: list[tuple[int, int, int, str]] = []
+    if args.workers <= 1:
+        for task in tasks:
+            results.extend(run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for chunk in pool.map(run_chunk, tasks):
+                results.extend(chunk)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results, args.sim_hz)
+    summary["parametros"] = {**params, "politica": args.policy, "reaccion": args.reaction, "semilla": args.seed, "sim_hz": args.sim_hz}
+    summary["tiempo_s"] = round(elapsed, 2)
+    summary["pasos_por_s"] = round(sum(steps for steps, *_rest in results) / elapsed)
+
+    print(f"{summary['partidas']} partidas en {elapsed:.1f} s con {args.workers} procesos ({summary['pasos_por_s']} pasos/s)")
+    for label in ("supervivencia_s", "puntuacion", "monedas"):
+        stats = summary[label]
+        print(f"{label:<16}" + "  ".join(f"{key} {value:.1f}" for key, value in stats.items()))
+    print("causa de muerte  " + "  ".join(f"{cause} {share:.1%}" for cause, share in summary["causa_muerte"].items()))
+    if args.json:
+        args.json.write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
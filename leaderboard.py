@@ -0,0 +1,95 @@
+import json
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from pathlib import Path
+
+from storage import BatchWriter, atomic_write_text
+
+
+class LeaderboardWriter(BatchWriter):
+    # Reescribe el fichero del ranking en segundo plano; de varios récords seguidos solo
+    # se escribe el último estado
+    name = "leaderboard-writer"
+
+    def __init__(self, path: Path, source: str) -> None:
+        self.path = path
+        self.source = source
+        super().__init__()
+
+    def write_batch(self, batch: dict[str, dict[str, list[tuple[int, str]]]]) -> None:
+        for snapshot in batch.values():
+            write_board(self.path, self.source, snapshot["order"])
+        self.writes += 1
+
+
+class Leaderboard:
+    # Récords de todas las cuentas en una lista ordenada (-récord, usuario). Cambiar un
+    # récord es una búsqueda binaria + inserción, el top N es un slice y la posición de
+    # un jugador otra búsqueda binaria: nunca se recorren todas las cuentas.
+    def __init__(self, scores: Iterable[tuple[str, int]] = ()) -> None:
+        self.best: dict[str, int] = {user: int(best) for user, best in scores if int(best) > 0}
+        self.order: list[tuple[int, str]] = sorted((-best, user) for user, best in self.best.items())
+        self.writer: LeaderboardWriter | None = None
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def submit(self, username: str, best: int) -> bool:
+        old = self.best.get(username, 0)
+        if best <= old:
+            return False
+        if old:
+            del self.order[bisect_left(self.order, (-old, username))]
+        insort(self.order, (-best, username))
+        self.best[username] = best
+        if self.writer is not None:
+            # Copia de la lista (el hilo no puede recorrer la que se sigue modificando)
+            self.writer.put("board", {"order": list(self.order)})
+        return True
+
+    def rank_of_score(self, best: int) -> int:
+        # Empates comparten puesto: (-best,) va delante de cualquier (-best, usuario)
+        return bisect_left(self.order, (-best,)) + 1
+
+    def rank(self, username: str) -> int | None:
+        best = self.best.get(username)
+        return None if best is None else self.rank_of_score(best)
+
+    def top(self, count: int) -> list[tuple[int, str, int]]:
+        return [(self.rank_of_score(-neg), user, -neg) for neg, user in self.order[:count]]
+
+    @classmethod
+    def open(cls, path: Path, accounts) -> "Leaderboard":
+        # El fichero se mantiene al día con cada récord nuevo, así que un cierre brusco
+        # no obliga a reconstruirlo. Solo si falta o es de otro almacén se construye desde
+        # las cuentas (y se guarda enseguida para el siguiente arranque).
+        board = cls.load(path, accounts.kind)
+        rebuilt = board is None
+        if board is None:
+            board = cls(accounts.scores())
+        board.writer = LeaderboardWriter(path, accounts.kind)
+        if rebuilt:
+            board.writer.put("board", {"order": list(board.order)})
+        return board
+
+    @classmethod
+    def load(cls, path: Path, source: str) -> "Leaderboard | None":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("source") != source:
+            return None
+        board = cls()
+        board.best = {str(user): int(best) for user, best in data.get("entries", [])}
+        board.order = sorted((-best, user) for user, best in board.best.items())
+        return board
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def write_board(path: Path, source: str, order: list[tuple[int, str]]) -> None:
+    entries = [[user, -neg] for neg, user in order]
+    atomic_write_text(path, json.dumps({"source": source, "entries": entries}, ensure_ascii=False, separators=(",", ":")))
@@ -0,0 +1,127 @@
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections.abc import Callable
+from email.message import EmailMessage
+
+SMTP_TIMEOUT_S = 12
+SEND_ATTEMPTS = 3
+RETRY_BACKOFF_S = 0.5
+IDLE_CLOSE_S = 60.0
+
+
+class SmtpConfig:
+    def __init__(self, host: str, port: int, user: str, password: str, sender: str, starttls: bool = True) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender
+        self.starttls = starttls
+
+    @classmethod
+    def from_env(cls) -> "SmtpConfig":
+        user = os.getenv("SMTP_USER", "")
+        return cls(
+            host=os.getenv("SMTP_HOST", ""),
+            port=int(os.getenv("SMTP_PORT", "587")),
+            user=user,
+            password=os.getenv("SMTP_PASS", ""),
+            sender=os.getenv("SMTP_SENDER", user),
+            # SMTP_STARTTLS=0 para un servidor local de pruebas sin TLS
+            starttls=os.getenv("SMTP_STARTTLS", "1") != "0",
+        )
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host and self.user and self.password and self.sender)
+
+
+class Mailer:
+    # Hilo de envío de correo. Mantiene abierta la conexión ya autenticada entre envíos,
+    # reintenta con espera creciente y deja el resultado en una cola que el hilo de Tk
+    # vacía con poll() en su tick, así que la ventana nunca espera al servidor.
+    def __init__(self, config: SmtpConfig, connect: Callable[..., smtplib.SMTP] = smtplib.SMTP) -> None:
+        self.config = config
+        self.connect = connect
+        self.server: smtplib.SMTP | None = None
+        self.last_used = 0.0
+        self.connections = 0
+        self.jobs: queue.Queue[tuple[EmailMessage, Callable[[bool], None]] | None] = queue.Queue()
+        self.results: queue.SimpleQueue[tuple[Callable[[bool], None], bool]] = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="mailer", daemon=True)
+        self.thread.start()
+
+    def send(self, msg: EmailMessage, callback: Callable[[bool], None]) -> None:
+        self.jobs.put((msg, callback))
+
+    def poll(self) -> None:
+        while True:
+            try:
+                callback, ok = self.results.get_nowait()
+            except queue.Empty:
+                return
+            callback(ok)
+
+    def close(self, timeout: float | None = 2.0) -> None:
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def open_server(self) -> smtplib.SMTP:
+        server = self.connect(self.config.host, self.config.port, timeout=SMTP_TIMEOUT_S)
+        try:
+            if self.config.starttls:
+                server.starttls()
+            if self.config.user:
+                server.login(self.config.user, self.config.password)
+        except BaseException:
+            server.close()
+            raise
+        self.connections += 1
+        return server
+
+    def drop_server(self, quit_first: bool = False) -> None:
+        server, self.server = self.server, None
+        if server is None:
+            return
+        try:
+            if quit_first:
+                server.quit()
+            else:
+                server.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def deliver(self, msg: EmailMessage) -> bool:
+        for attempt in range(SEND_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_BACKOFF_S * 2 ** (attempt - 1))
+            try:
+                if self.server is None:
+                    self.server = self.open_server()
+                self.server.send_message(msg)
+                self.last_used = time.monotonic()
+                return True
+            except smtplib.SMTPRecipientsRefused:
+                # Reintentar no va a cambiar la respuesta del servidor
+                return False
+            except (smtplib.SMTPException, OSError):
+                # Conexión caída o servidor lento: se abre otra en el siguiente intento
+                self.drop_server()
+        return False
+
+    def run(self) -> None:
+        while True:
+            try:
+                job = self.jobs.get(timeout=IDLE_CLOSE_S if self.server is not None else None)
+            except queue.Empty:
+                # Sin correos en un rato: el servidor la cerraría igualmente
+                self.drop_server(quit_first=True)
+                continue
+            if job is None:
+                self.drop_server(quit_first=True)
+                return
+            msg, callback = job
+            self.results.put((callback, self.deliver(msg)))
@@ -1,40 +1,64 @@
-import json
+import argparse
 import os
 import random
-import smtplib
 import time
 import tkinter as tk
 from email.message import EmailMessage
 from pathlib import Path
 
+from asset_manager import MONO_FAMILY, AssetManager
+from auth import AuthWorker, SessionCache, hash_password, verify_password
+from leaderboard import Leaderboard
+from mailer import Mailer, SmtpConfig
+from profiler import FrameProfiler, RateMeter
+from quality import QualityGovernor
+from replay import Recording, ReplayInput, RunRecorder
+from simulation import COIN_VALUE, EVENT_COIN, EVENT_DEATH, EVENT_SCORE, INPUT_CROUCH, INPUT_JUMP, KIND_BIRD, KIND_COIN, SIM_HZ, GameSimulation
+from sprites import SpriteCache, SpriteCanvas
+from storage import open_account_store
+
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE_PATH = os.path.join(ROOT_DIR, "accounts_data.json")
 ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
-CACTUS_ASSETS_DIR = os.path.join(ASSETS_DIR, "cactus")
+
+LEADERBOARD_PATH = os.path.join(ROOT_DIR, "leaderboard.json")
+LEADERBOARD_ROWS = 10
+REPLAYS_DIR = os.path.join(ROOT_DIR, "replays")
 
 BASE_WIDTH = 1280
 BASE_HEIGHT = 720
-GRAVITY = 0.6
-JUMP_FORCE = -11
-SPAWN_MIN = 900
-SPAWN_MAX = 1700
-FRAME_MS = 20
-BIRD_SCORE_THRESHOLD = 500
-COIN_SPAWN_MIN = 1200
-COIN_SPAWN_MAX = 2200
-COIN_SPAWN_CHANCE = 0.9
+MAX_CATCH_UP_MS = 100
 BG_COLOR = "#111827"
 SKY_SWITCH_POINTS = 750
+GRASS_SPACING = 145
 
 
 class DinoRunner:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(self, root: tk.Tk, replay: Recording | None = None, quality: str | None = None, sim_hz: int = SIM_HZ, render_hz: int = SIM_HZ) -> None:
         self.root = root
+        # Con una grabación se reproduce esa partida (teclado ignorado) en vez de jugar
+        self.replay = replay
+        self.replay_input: ReplayInput | None = None
+        self.recorder: RunRecorder | None = None
+        # Simulación y render van a frecuencias distintas; la repetición usa la de la grabación
+        self.sim_hz = replay.tick_hz if replay is not None else sim_hz
+        self.render_hz = render_hz
+        self.sim_tick_ms = 1000.0 / self.sim_hz
+        self.render_ms = 1000.0 / self.render_hz
         self.root.title("Modern Dinosaur Game")
         self.root.configure(bg="#0f172a")
         self.root.geometry(f"{BASE_WIDTH}x{BASE_HEIGHT}")
-        self.data_file = Path(__file__).with_name("accounts_data.json")
-        self.accounts = self.load_accounts()
+        # Fuentes, colores y sprites de cactus cargados una vez para toda la ventana
+        self.assets = AssetManager(root, Path(ASSETS_DIR))
+        self.accounts = open_account_store(Path(ROOT_DIR))
+        # Índice de récords: se carga de su fichero (al día con cada récord) o, si falta, se construye una vez
+        self.leaderboard = Leaderboard.open(Path(LEADERBOARD_PATH), self.accounts)
+        # El hash de contraseñas (scrypt) va en otro hilo para no congelar la ventana
+        self.auth = AuthWorker()
+        self.sessions = SessionCache()
+        self.auth_pending = False
+        self.smtp_config = SmtpConfig.from_env()
+        self.mailer = Mailer(self.smtp_config)
         self.current_user = ""
 
         self.score_var = tk.StringVar(value="Puntaje: 0")
@@ -43,27 +67,29 @@ class DinoRunner:
 
         self.best_score = 0
         self.emilianos = 0
-        self.running = True
         self.game_width = BASE_WIDTH - 32
         self.game_height = BASE_HEIGHT - 120
         self.ground_y = self.game_height - 170
-        self.cactus_images = self.load_cactus_images()
+        self.sim = GameSimulation(self.game_width, self.game_height, self.assets.load_cactus(), tick_hz=self.sim_hz)
+        self.jump_requested = False
+        self.crouch_held = False
+        self.sprites = SpriteCache(self.bake_sprite)
 
         hud = tk.Frame(root, bg="#0f172a")
         hud.pack(fill="x", padx=16, pady=(14, 6))
-        self.title_label = tk.Label(hud, text="Modern Dinosaur Game", fg="#e2e8f0", bg="#0f172a", font=("Segoe UI", 18, "bold"))
+        self.title_label = tk.Label(hud, text="Modern Dinosaur Game", fg="#e2e8f0", bg="#0f172a", font=self.assets.font(18))
         self.title_label.pack(side="left")
 
         stats = tk.Frame(hud, bg="#0f172a")
         stats.pack(side="right")
-        self.emilianos_label = tk.Label(stats, textvariable=self.emilianos_var, fg="#fbbf24", bg="#0f172a", font=("Segoe UI", 18, "bold"))
+        self.emilianos_label = tk.Label(stats, textvariable=self.emilianos_var, fg="#fbbf24", bg="#0f172a", font=self.assets.font(18))
         self.emilianos_label.pack(side="left", padx=10)
-        self.score_label = tk.Label(stats, textvariable=self.score_var, fg="#67e8f9", bg="#0f172a", font=("Segoe UI", 18, "bold"))
+        self.score_label = tk.Label(stats, textvariable=self.score_var, fg="#67e8f9", bg="#0f172a", font=self.assets.font(18))
         self.score_label.pack(side="left", padx=10)
 
         self.record_box = tk.Frame(stats, bg="#0f172a")
         self.record_box.pack(side="left", padx=10)
-        self.best_label = tk.Label(self.record_box, textvariable=self.best_var, fg="#a5b4fc", bg="#0f172a", font=("Segoe UI", 18, "bold"))
+        self.best_label = tk.Label(self.record_box, textvariable=self.best_var, fg="#a5b4fc", bg="#0f172a", font=self.assets.font(18))
         self.best_label.pack(anchor="e")
 
         self.canvas = tk.Canvas(root, width=BASE_WIDTH - 32, height=BASE_HEIGHT - 120, bg=BG_COLOR, highlightthickness=0)
@@ -74,10 +100,18 @@ class DinoRunner:
             text="Espacio / ↑: saltar · ↓: agacharse · R: pausar juego",
             fg="#cbd5e1",
             bg="#0f172a",
-            font=("Segoe UI", 14, "bold"),
+            font=self.assets.font(14),
         )
         self.help_label.pack(pady=(0, 14))
 
+        # Overlay de rendimiento (F3) y grabación CSV (F4)
+        self.profiler = FrameProfiler()
+        self.profiler_label = tk.Label(root, text="", justify="left", anchor="nw", fg="#e2e8f0", bg="#020617", font=self.assets.font(11, family=MONO_FAMILY))
+        # Nivel de detalle de la partida según lo que tarda cada frame (o fijo con --quality)
+        self.quality = QualityGovernor.from_env(self.render_ms, quality)
+        self.render_rate = RateMeter()
+        self.sim_rate = RateMeter()
+
         self.login_var = tk.StringVar()
         self.password_var = tk.StringVar()
         self.login_status_var = tk.StringVar(value="")
@@ -93,16 +127,20 @@ class DinoRunner:
         self.register_status_var = tk.StringVar(value="")
         self.recovery_code = ""
         self.recovery_verified_email = ""
-        self.login_entry = tk.Entry(root, textvariable=self.login_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a")
-        self.password_entry = tk.Entry(root, textvariable=self.password_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
-        self.recover_email_entry = tk.Entry(root, textvariable=self.recover_email_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a")
-        self.recover_code_entry = tk.Entry(root, textvariable=self.recover_code_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a")
-        self.recover_new_pass_entry = tk.Entry(root, textvariable=self.recover_new_pass_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
-        self.recover_confirm_pass_entry = tk.Entry(root, textvariable=self.recover_confirm_pass_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
-        self.register_user_entry = tk.Entry(root, textvariable=self.register_user_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a")
-        self.register_email_entry = tk.Entry(root, textvariable=self.register_email_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a")
-        self.register_pass_entry = tk.Entry(root, textvariable=self.register_pass_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
-        self.register_confirm_entry = tk.Entry(root, textvariable=self.register_confirm_var, font=("Segoe UI", 18, "bold"), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
+        self.menu_dirty = True
+        self.drawn_screen = ""
+        for var in (self.login_status_var, self.recover_status_var, self.register_status_var):
+            var.trace_add("write", self.invalidate)
+        self.login_entry = tk.Entry(root, textvariable=self.login_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a")
+        self.password_entry = tk.Entry(root, textvariable=self.password_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
+        self.recover_email_entry = tk.Entry(root, textvariable=self.recover_email_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a")
+        self.recover_code_entry = tk.Entry(root, textvariable=self.recover_code_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a")
+        self.recover_new_pass_entry = tk.Entry(root, textvariable=self.recover_new_pass_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
+        self.recover_confirm_pass_entry = tk.Entry(root, textvariable=self.recover_confirm_pass_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
+        self.register_user_entry = tk.Entry(root, textvariable=self.register_user_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a")
+        self.register_email_entry = tk.Entry(root, textvariable=self.register_email_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a")
+        self.register_pass_entry = tk.Entry(root, textvariable=self.register_pass_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
+        self.register_confirm_entry = tk.Entry(root, textvariable=self.register_confirm_var, font=self.assets.font(18), justify="center", bg="#e2e8f0", fg="#0f172a", show="•")
 
         self.skins = {
             "default": {
@@ -122,35 +160,32 @@ class DinoRunner:
         }
         self.equipped_skin = "default"
 
-        self.screen = "login"  # login | register_account | recover_password | main_menu | shop | skins_menu | playing | pause_menu | game_over_menu
+        self.screen = "login"  # login | register_account | recover_password | main_menu | shop | skins_menu | leaderboard | playing | pause_menu | game_over_menu
         self.buttons: list[tuple[float, float, float, float, str]] = []
+        self.scene_keys: dict[str, tuple] = {}
+        self.scene_nodes: dict[int, list] = {}
+        self.scene_live = False
+        self.sky_cache: dict[tuple[int, int, int, bool, str], str] = {}
+        self.sky_shown: tuple[int, int, int, bool, str] | None = None
 
         self.reset_run(reset_record=True)
+        self.render_alpha = 0.0
+        self.sim_accumulator_ms = 0.0
+        self.last_tick = time.perf_counter()
+        self.tick_due = self.last_tick
+        self.frame_due = self.last_tick
 
         self.root.bind("r", self.on_restart_request)
         self.root.bind("R", self.on_restart_request)
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<Configure>", self.on_resize)
         self.root.bind("<Return>", self.on_enter_key)
+        self.root.bind("<F3>", self.on_toggle_profiler)
+        self.root.bind("<F4>", self.on_toggle_profile_recording)
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.loop()
 
-    def load_accounts(self) -> dict[str, dict[str, object]]:
-        if not self.data_file.exists():
-            return {}
-        try:
-            data = json.loads(self.data_file.read_text(encoding="utf-8"))
-            return data if isinstance(data, dict) else {}
-        except (OSError, json.JSONDecodeError):
-            return {}
-
-    def save_accounts(self) -> None:
-        try:
-            self.data_file.write_text(json.dumps(self.accounts, ensure_ascii=False, indent=2), encoding="utf-8")
-        except OSError:
-            pass
-
     def save_current_account(self) -> None:
         if not self.current_user:
             return
@@ -167,41 +202,77 @@ class DinoRunner:
             "equipped_skin": self.equipped_skin,
             "owned_skins": owned,
         }
+        # Guardado por fila: cada almacén lo agrupa y lo escribe en su propio hilo
         self.accounts[self.current_user] = updated_info
-        self.save_accounts()
+
+    def account_status_var(self) -> tk.StringVar:
+        # Etiqueta de estado de la pantalla de cuentas visible (login si no hay ninguna)
+        return {"register_account": self.register_status_var, "recover_password": self.recover_status_var}.get(self.screen, self.login_status_var)
+
+    def account_save_failed(self, username: str, exc: Exception) -> None:
+        # El almacén ya devolvió la cuenta a lo guardado en disco
+        self.account_status_var().set(f"No se pudo guardar la cuenta '{username}'. Inténtalo de nuevo")
 
     def is_valid_email(self, value: str) -> bool:
         email = value.strip()
         return "@" in email and "." in email
 
     def find_account_by_email(self, email: str) -> str:
-        normalized = email.strip().lower()
-        if not normalized:
-            return ""
-        return next(
-            (
-                username
-                for username, info in self.accounts.items()
-                if isinstance(info, dict) and str(info.get("email", "")).strip().lower() == normalized
-            ),
-            "",
-        )
+        return self.accounts.find_by_email(email)
+
+    def start_login(self, username: str, password: str) -> None:
+        info = self.accounts.get(username)
+        stored = str(info.get("password", "")) if isinstance(info, dict) else None
+        if stored is not None and self.sessions.check(username, password, stored):
+            self.finish_login(username, password, stored, (True, None))
+            return
+        self.auth_pending = True
+        self.login_status_var.set("Comprobando contraseña...")
+        if stored is None:
+            # Usuario nuevo: se crea al entrar, como siempre, pero ya con la contraseña hasheada
+            self.auth.submit(hash_password, (password,), lambda hashed: self.finish_login(username, password, None, (True, hashed)), lambda exc: self.auth_failed(self.login_status_var, exc))
+        else:
+            self.auth.submit(verify_password, (password, stored), lambda result: self.finish_login(username, password, stored, result), lambda exc: self.auth_failed(self.login_status_var, exc))
 
-    def apply_account(self, username: str, password: str) -> bool:
+    def auth_failed(self, status_var: tk.StringVar, exc: Exception) -> None:
+        # El hilo de hash sigue vivo: se libera la pantalla para poder reintentar
+        self.auth_pending = False
+        status_var.set("No se pudo procesar la contraseña. Inténtalo de nuevo")
+
+    def finish_login(self, username: str, password: str, stored: str | None, result: tuple[bool, str | None]) -> None:
+        self.auth_pending = False
+        if self.screen != "login":
+            return
+        ok, new_hash = result
         info = self.accounts.get(username)
+        current = str(info.get("password", "")) if isinstance(info, dict) else None
+        if current != stored:
+            # La cuenta cambió mientras se comprobaba: se vuelve a empezar con lo actual
+            self.start_login(username, password)
+            return
+        if not ok:
+            self.login_status_var.set("Usuario o contraseña incorrectos")
+            return
         if not isinstance(info, dict):
             info = {
-                "password": password,
+                "password": "",
                 "email": "",
                 "emilianos": 0,
                 "best_score": 0,
                 "equipped_skin": "default",
                 "owned_skins": ["default"],
             }
+        if new_hash:
+            # Cuentas nuevas y cuentas antiguas con la contraseña en claro
+            info["password"] = new_hash
             self.accounts[username] = info
-        elif str(info.get("password", "")) != password:
-            return False
+        self.sessions.remember(username, password, str(info["password"]))
+        self.enter_account(username, info)
+        self.login_status_var.set("")
+        self.screen = "main_menu"
+        self.password_var.set("")
 
+    def enter_account(self, username: str, info: dict[str, object]) -> None:
         self.current_user = username
         self.emilianos = int(info.get("emilianos", 0))
         self.best_score = int(info.get("best_score", 0))
@@ -216,41 +287,38 @@ class DinoRunner:
         self.score_var.set("Puntaje: 0")
         self.best_var.set(f"Récord: {self.best_score}")
         self.emilianos_var.set(f"Emilianos: {self.emilianos}")
+        self.leaderboard.submit(username, self.best_score)
         self.save_current_account()
-        return True
 
     def generate_recovery_code(self, length: int = 6) -> str:
         digits = "0123456789"
         return "".join(random.choice(digits) for _ in range(max(1, int(length))))
 
-    def send_recovery_code(self, recipient: str, code: str) -> tuple[bool, str]:
-        host = os.getenv("SMTP_HOST", "")
-        port = int(os.getenv("SMTP_PORT", "587"))
-        user = os.getenv("SMTP_USER", "")
-        password = os.getenv("SMTP_PASS", "")
-        sender = os.getenv("SMTP_SENDER", user)
-
-        if not host or not user or not password or not sender:
-            return False, "SMTP no configurado (define SMTP_HOST/SMTP_USER/SMTP_PASS/SMTP_SENDER)."
+    def send_recovery_code(self, recipient: str, code: str) -> None:
+        config = self.smtp_config
+        if not config.configured:
+            self.recover_status_var.set("SMTP no configurado (define SMTP_HOST/SMTP_USER/SMTP_PASS/SMTP_SENDER).")
+            return
 
         msg = EmailMessage()
         msg["Subject"] = "Código de recuperación - Modern Dinosaur Game"
-        msg["From"] = sender
+        msg["From"] = config.sender
         msg["To"] = recipient
         msg.set_content(f"Tu código de recuperación es: {code}")
 
-        try:
-            with smtplib.SMTP(host, port, timeout=12) as server:
-                server.starttls()
-                server.login(user, password)
-                server.send_message(msg)
-            return True, f"Código enviado a {recipient}"
-        except Exception:
-            return False, "No se pudo enviar el correo. Revisa la configuración SMTP."
-
-    def send_recovery_email(self, recipient: str, code: str) -> tuple[bool, str]:
+        def on_sent(ok: bool) -> None:
+            if code != self.recovery_code:
+                # Ya se pidió otro código: este resultado no interesa
+                return
+            self.recover_status_var.set(f"Código enviado a {recipient}" if ok else "No se pudo enviar el correo. Revisa la configuración SMTP.")
+
+        # El envío va en el hilo del mailer; el estado se actualiza desde loop()
+        self.recover_status_var.set(f"Enviando código a {recipient}...")
+        self.mailer.send(msg, on_sent)
+
+    def send_recovery_email(self, recipient: str, code: str) -> None:
         # Compatibilidad con llamadas existentes.
-        return self.send_recovery_code(recipient, code)
+        self.send_recovery_code(recipient, code)
 
     def on_enter_key(self, _event=None) -> None:
         if self.screen == "login":
@@ -260,108 +328,99 @@ class DinoRunner:
         elif self.screen == "register_account":
             self.handle_action("register")
 
+    def on_toggle_profiler(self, _event=None) -> None:
+        self.profiler.enabled = not self.profiler.enabled
+        if self.profiler.enabled:
+            self.profiler_label.config(text="midiendo...")
+            self.profiler_label.place(in_=self.canvas, x=8, y=8)
+            self.profiler_label.lift()
+        else:
+            self.profiler_label.place_forget()
+
+    def on_toggle_profile_recording(self, _event=None) -> None:
+        if not self.profiler.recording:
+            if not self.profiler.enabled:
+                self.on_toggle_profiler()
+            self.profiler.start_recording()
+            return
+        path = Path(ROOT_DIR) / time.strftime("profile_%Y%m%d_%H%M%S.csv")
+        try:
+            frames = self.profiler.stop_recording(path)
+        except OSError as exc:
+            print(f"No se pudo guardar el perfil: {exc}")
+            return
+        print(f"Perfil guardado en {path} ({frames} frames)")
+
     def on_close(self) -> None:
         self.save_current_account()
+        self.accounts.close()
+        self.mailer.close()
+        self.leaderboard.close()
         self.root.destroy()
 
     def on_resize(self, event: tk.Event) -> None:
         self.game_width = max(700, int(event.width))
         self.game_height = max(420, int(event.height))
         self.ground_y = self.game_height - 170
-
-        self.player_y = self.ground_y - self.player_h
-        for obs in self.obstacles:
-            if obs["type"] == "cactus":
-                obs["y"] = self.ground_y - float(obs["h"])
-
-    def load_cactus_images(self) -> list[tk.PhotoImage]:
-        assets_dir = Path(CACTUS_ASSETS_DIR)
-        if not assets_dir.is_dir():
-            return []
-
-        images: list[tk.PhotoImage] = []
-        for image_path in sorted(assets_dir.glob("*.png")):
-            try:
-                images.append(tk.PhotoImage(file=str(image_path)))
-            except tk.TclError:
-                continue
-        return images
+        self.invalidate_sky()
+        self.invalidate()
+        if self.replay is not None:
+            # La repetición mantiene el tamaño grabado para que la partida sea la misma
+            self.ground_y = self.sim.ground_y
+            return
+        self.sim.resize(self.game_width, self.game_height)
+        if self.recorder is not None:
+            self.recorder.resize(self.sim.steps, self.sim.width, self.sim.height)
 
     def reset_run(self, reset_record: bool) -> None:
         if reset_record:
             self.best_score = 0
 
-        self.player_x = 100
-        self.player_w = 58
-        self.player_h = 50
-        self.stand_h = 50
-        self.crouch_h = 34
-        self.player_y = self.ground_y - self.player_h
-        self.vel_y = 0
-        self.grounded = True
-        self.crouching = False
-
-        self.speed = 8.0
         if not hasattr(self, "_movement_binds_ready"):
             self.root.bind("<space>", self.on_jump, add="+")
             self.root.bind("<Up>", self.on_jump, add="+")
             self.root.bind("<Down>", self.on_crouch_press, add="+")
             self.root.bind("<KeyRelease-Down>", self.on_crouch_release, add="+")
             self._movement_binds_ready = True
-        self.score = 0
-        self.score_elapsed_ms = 0
-        self.spawn_timer = random.randint(SPAWN_MIN, SPAWN_MAX)
-        self.coin_timer = random.randint(COIN_SPAWN_MIN, COIN_SPAWN_MAX)
-        self.obstacles: list[dict[str, object]] = []
-        self.coins: list[dict[str, float]] = []
-        self.running = True
+        if self.replay is not None:
+            # Los tamaños de cactus de la grabación, no los de los assets locales: el
+            # recorrido elige cactus por índice y con otro juego de imágenes sería otro
+            self.sim.cactus_sizes = list(self.replay.cactus_sizes)
+            self.sim.resize(self.replay.width, self.replay.height)
+            self.sim.reset(seed=self.replay.seed)
+            self.ground_y = self.sim.ground_y
+            self.replay_input = ReplayInput(self.replay)
+        else:
+            # Semilla nueva por partida: con ella y las entradas grabadas se puede repetir
+            self.sim.reset(seed=random.randrange(2**32))
+            self.recorder = RunRecorder(self.sim.seed, self.sim.width, self.sim.height, self.sim.cactus_sizes, self.sim.tick_hz)
+        self.jump_requested = False
+        self.crouch_held = False
         self.score_var.set("Puntaje: 0")
         self.best_var.set(f"Récord: {self.best_score}")
         self.emilianos_var.set(f"Emilianos: {self.emilianos}")
 
     def restart_keep_progress(self) -> None:
-        current_score = self.score
-        current_best = self.best_score
-
-        self.player_x = 100
-        self.player_w = 58
-        self.player_h = 50
-        self.player_y = self.ground_y - self.player_h
-        self.vel_y = 0
-        self.grounded = True
-        self.crouching = False
-
-        self.speed = 8.0
-        self.score = current_score
-        self.best_score = current_best
-        self.score_elapsed_ms = 0
-        self.spawn_timer = random.randint(SPAWN_MIN, SPAWN_MAX)
-        self.coin_timer = random.randint(COIN_SPAWN_MIN, COIN_SPAWN_MAX)
-        self.obstacles = []
-        self.coins = []
-        self.running = True
-        self.score_var.set(f"Puntaje: {self.score}")
+        self.sim.reset(keep_score=True)
+        self.jump_requested = False
+        self.crouch_held = False
+        self.score_var.set(f"Puntaje: {self.sim.score}")
         self.best_var.set(f"Récord: {self.best_score}")
         self.emilianos_var.set(f"Emilianos: {self.emilianos}")
 
     def on_crouch_press(self, _event=None) -> None:
-        if self.screen != "playing" or not self.running:
+        if self.screen != "playing" or not self.sim.running:
             return
-        if not self.crouching:
-            self.crouching = True
-            self.player_h = self.crouch_h
-            self.player_y = self.ground_y - self.player_h
+        # Como el salto, agacharse se aplica en el siguiente paso (así queda grabado igual)
+        self.crouch_held = True
 
     def on_crouch_release(self, _event=None) -> None:
-        if self.crouching:
-            self.crouching = False
-            self.player_h = self.stand_h
-            self.player_y = self.ground_y - self.player_h
+        self.crouch_held = False
 
     def on_jump(self, _event=None) -> None:
-        if self.screen == "playing" and self.running and self.grounded:
-            self.vel_y = JUMP_FORCE
-            self.grounded = False
+        # El salto se aplica al inicio del siguiente paso de simulación
+        if self.screen == "playing" and self.sim.running and self.sim.grounded:
+            self.jump_requested = True
 
     def on_restart_request(self, _event=None) -> None:
         if self.screen == "playing":
@@ -373,22 +432,61 @@ class DinoRunner:
                 self.handle_action(action)
                 return
 
-        if self.screen == "playing" and self.running:
+        if self.screen == "playing" and self.sim.running:
             self.on_jump()
 
+    def finish_register(self, user: str, email: str, hashed: str) -> None:
+        self.auth_pending = False
+        # Se repiten las comprobaciones: la cuenta pudo crearse mientras se hacía el hash
+        if user in self.accounts:
+            self.register_status_var.set("Ese usuario ya existe")
+            return
+        if self.find_account_by_email(email):
+            self.register_status_var.set("Ese correo ya está registrado")
+            return
+        self.accounts[user] = {
+            "password": hashed,
+            "email": email,
+            "emilianos": 0,
+            "best_score": 0,
+            "equipped_skin": "default",
+            "owned_skins": ["default"],
+        }
+        self.login_var.set(user)
+        self.password_var.set("")
+        self.register_status_var.set("Cuenta creada. Inicia sesión")
+        if self.screen == "register_account":
+            self.screen = "login"
+
+    def finish_reset(self, target_user: str, hashed: str) -> None:
+        self.auth_pending = False
+        info = self.accounts.get(target_user)
+        if not isinstance(info, dict):
+            self.recover_status_var.set("Cuenta inválida")
+            return
+        info["password"] = hashed
+        self.accounts[target_user] = info
+        self.login_var.set(target_user)
+        self.password_var.set("")
+        self.recover_status_var.set("Contraseña actualizada. Inicia sesión")
+        self.recover_code_var.set("")
+        self.recover_new_pass_var.set("")
+        self.recover_confirm_pass_var.set("")
+        self.recovery_code = ""
+        self.recovery_verified_email = ""
+        if self.screen == "recover_password":
+            self.screen = "login"
+
     def handle_action(self, action: str) -> None:
+        if self.auth_pending and action in {"login", "register", "reset_password"}:
+            return
         if action == "login":
             username = self.login_var.get().strip()
             password = self.password_var.get()
             if not username or not password:
                 self.login_status_var.set("Completa usuario y contraseña")
                 return
-            if self.apply_account(username, password):
-                self.login_status_var.set("")
-                self.screen = "main_menu"
-                self.password_var.set("")
-                return
-            self.login_status_var.set("Usuario o contraseña incorrectos")
+            self.start_login(username, password)
             return
         if action == "open_recover":
             self.recover_status_var.set("")
@@ -428,19 +526,9 @@ class DinoRunner:
             if self.find_account_by_email(email):
                 self.register_status_var.set("Ese correo ya está registrado")
                 return
-            self.accounts[user] = {
-                "password": pwd,
-                "email": email,
-                "emilianos": 0,
-                "best_score": 0,
-                "equipped_skin": "default",
-                "owned_skins": ["default"],
-            }
-            self.save_accounts()
-            self.login_var.set(user)
-            self.password_var.set("")
-            self.register_status_var.set("Cuenta creada. Inicia sesión")
-            self.screen = "login"
+            self.auth_pending = True
+            self.register_status_var.set("Creando cuenta...")
+            self.auth.submit(hash_password, (pwd,), lambda hashed: self.finish_register(user, email, hashed), lambda exc: self.auth_failed(self.register_status_var, exc))
             return
         if action == "back_login_from_register":
             self.screen = "login"
@@ -456,8 +544,7 @@ class DinoRunner:
                 return
             self.recovery_code = self.generate_recovery_code(6)
             self.recovery_verified_email = ""
-            ok, msg = self.send_recovery_code(email, self.recovery_code)
-            self.recover_status_var.set(msg)
+            self.send_recovery_code(email, self.recovery_code)
             return
         if action == "verify_recovery":
             if not self.recovery_code:
@@ -496,18 +583,9 @@ class DinoRunner:
                 self.recover_status_var.set("Cuenta inválida")
                 return
 
-            info["password"] = new_password
-            self.accounts[target_user] = info
-            self.save_accounts()
-            self.login_var.set(target_user)
-            self.password_var.set("")
-            self.recover_status_var.set("Contraseña actualizada. Inicia sesión")
-            self.recover_code_var.set("")
-            self.recover_new_pass_var.set("")
-            self.recover_confirm_pass_var.set("")
-            self.recovery_code = ""
-            self.recovery_verified_email = ""
-            self.screen = "login"
+            self.auth_pending = True
+            self.recover_status_var.set("Guardando contraseña...")
+            self.auth.submit(hash_password, (new_password,), lambda hashed: self.finish_reset(target_user, hashed), lambda exc: self.auth_failed(self.recover_status_var, exc))
             return
         if action == "back_login":
             self.screen = "login"
@@ -522,7 +600,8 @@ class DinoRunner:
             self.reset_run(reset_record=False)
             return
         if action == "exit":
-            self.root.destroy()
+            # Igual que cerrar la ventana: vacía el escritor en segundo plano antes de salir
+            self.on_close()
             return
         if action == "open_shop":
             self.screen = "shop"
@@ -530,9 +609,12 @@ class DinoRunner:
         if action == "open_skins":
             self.screen = "skins_menu"
             return
+        if action == "open_leaderboard":
+            self.screen = "leaderboard"
+            return
         if action == "back_menu":
             self.screen = "main_menu"
-            self.running = True
+            self.sim.running = True
             return
         if action == "continue_play":
             self.screen = "playing"
@@ -553,6 +635,7 @@ class DinoRunner:
             if skin["owned"]:
                 self.equipped_skin = key
             self.save_current_account()
+            self.invalidate()
             return
         if action.startswith("equip:"):
             key = action.split(":", 1)[1]
@@ -560,121 +643,76 @@ class DinoRunner:
             if skin and skin["owned"]:
                 self.equipped_skin = key
                 self.save_current_account()
+                self.invalidate()
                 return
 
-    def spawn_obstacle(self) -> None:
-        can_spawn_bird = self.score >= BIRD_SCORE_THRESHOLD
-        spawn_bird = can_spawn_bird and random.random() < 0.4
-
-        if spawn_bird:
-            flight_level = random.choice([90, 150, 210])
-            obstacle = {"type": "bird", "x": self.game_width + 30, "y": self.ground_y - flight_level, "w": 80, "h": 44, "image": None}
-        elif self.cactus_images:
-            sprite = random.choice(self.cactus_images)
-            obstacle = {"type": "cactus", "x": self.game_width + 20, "y": self.ground_y - sprite.height(), "w": sprite.width(), "h": sprite.height(), "image": sprite}
-        else:
-            tall = random.random() > 0.5
-            h = 60 if tall else 40
-            w = 28 if tall else 42
-            obstacle = {"type": "cactus", "x": self.game_width + 20, "y": self.ground_y - h, "w": w, "h": h, "image": None}
-        self.obstacles.append(obstacle)
-
-    def spawn_coin(self) -> None:
-        r = 22.0
-        y = self.ground_y - random.choice([44, 44, 44, 70, 120])
-        self.coins.append({"x": float(self.game_width + 30), "y": float(y), "r": r})
-
-    def collide(self, obs: dict[str, object]) -> bool:
-        px1, py1 = self.player_x + 6, self.player_y + 4
-        px2, py2 = px1 + self.player_w - 12, py1 + self.player_h - 6
-
-        ox1 = float(obs["x"])
-        oy1 = float(obs["y"])
-        ox2 = ox1 + float(obs["w"])
-        oy2 = oy1 + float(obs["h"])
-        return px1 < ox2 and px2 > ox1 and py1 < oy2 and py2 > oy1
-
-    def collect_coin(self, coin: dict[str, float]) -> bool:
-        px1, py1 = self.player_x + 6, self.player_y + 4
-        px2, py2 = px1 + self.player_w - 12, py1 + self.player_h - 6
-
-        cx = coin["x"] + coin["r"]
-        cy = coin["y"] + coin["r"]
-        closest_x = min(max(cx, px1), px2)
-        closest_y = min(max(cy, py1), py2)
-        dx = cx - closest_x
-        dy = cy - closest_y
-        return dx * dx + dy * dy <= coin["r"] * coin["r"]
-
     def update(self) -> None:
-        if self.screen != "playing" or not self.running:
+        if self.screen != "playing" or not self.sim.running:
             return
 
-        self.vel_y += GRAVITY
-        self.player_y += self.vel_y
-        if self.player_y >= self.ground_y - self.player_h:
-            self.player_y = self.ground_y - self.player_h
-            self.vel_y = 0
-            self.grounded = True
-
-        self.score_elapsed_ms += FRAME_MS
-        while self.score_elapsed_ms >= 1000:
-            self.score += 10
-            self.score_elapsed_ms -= 1000
-            self.score_var.set(f"Puntaje: {self.score}")
-
-        self.spawn_timer -= FRAME_MS
-        if self.spawn_timer <= 0:
-            self.spawn_obstacle()
-            self.spawn_timer = random.randint(SPAWN_MIN, SPAWN_MAX)
-
-        self.coin_timer -= FRAME_MS
-        if self.coin_timer <= 0:
-            if random.random() < COIN_SPAWN_CHANCE:
-                self.spawn_coin()
-            self.coin_timer = random.randint(COIN_SPAWN_MIN, COIN_SPAWN_MAX)
-
-        self.speed += 0.002
-        for obs in self.obstacles:
-            base_speed = self.speed * (1.25 if obs["type"] == "bird" else 1.0)
-            obs["x"] = float(obs["x"]) - base_speed
-            if obs["type"] == "cactus":
-                obs["y"] = self.ground_y - float(obs["h"])
-            if self.collide(obs):
-                self.running = False
-                self.best_score = max(self.best_score, self.score)
+        if self.replay_input is not None:
+            inputs = self.replay_input.apply(self.sim)
+            self.ground_y = self.sim.ground_y
+        else:
+            inputs = INPUT_CROUCH if self.crouch_held else 0
+            if self.jump_requested:
+                inputs |= INPUT_JUMP
+                self.jump_requested = False
+            if self.recorder is not None:
+                self.recorder.record(self.sim.steps, inputs)
+        events = self.sim.step(inputs)
+
+        if events & EVENT_SCORE:
+            self.score_var.set(f"Puntaje: {self.sim.score}")
+        if events & EVENT_DEATH:
+            new_record = self.sim.score > self.best_score
+            if new_record:
+                self.best_score = self.sim.score
                 self.best_var.set(f"Récord: {self.best_score}")
-                self.screen = "game_over_menu"
-                self.save_current_account()
-
-        new_coins: list[dict[str, float]] = []
-        for coin in self.coins:
-            coin["x"] -= self.speed * 1.05
-            if self.collect_coin(coin):
-                self.emilianos += 2
-                self.emilianos_var.set(f"Emilianos: {self.emilianos}")
-                self.save_current_account()
-                continue
-            if coin["x"] + coin["r"] * 2 > -40:
-                new_coins.append(coin)
-        self.coins = new_coins
+                if self.current_user:
+                    self.leaderboard.submit(self.current_user, self.best_score)
+            self.save_replay(new_record)
+            self.screen = "game_over_menu"
+        if events & EVENT_COIN:
+            self.emilianos += COIN_VALUE * self.sim.step_coins
+            self.emilianos_var.set(f"Emilianos: {self.emilianos}")
+        if events & (EVENT_COIN | EVENT_DEATH):
+            self.save_current_account()
 
-        self.obstacles = [obs for obs in self.obstacles if float(obs["x"]) + float(obs["w"]) > -50]
+    def save_replay(self, new_record: bool) -> None:
+        if self.replay is not None:
+            print(f"Repetición terminada: puntuación {self.sim.score} (grabada {self.replay.score})")
+            return
+        if self.recorder is None:
+            return
+        data = self.recorder.to_bytes(self.sim.steps, self.sim.score)
+        names = ["last.drec"]
+        if new_record and self.current_user:
+            safe_user = "".join(ch if ch.isalnum() else "_" for ch in self.current_user)
+            names.append(f"best_{safe_user}.drec")
+        try:
+            os.makedirs(REPLAYS_DIR, exist_ok=True)
+            for name in names:
+                Path(REPLAYS_DIR, name).write_bytes(data)
+        except OSError:
+            pass
 
-    def draw_player_default(self, x: float, y: float, base: str, dark: str) -> None:
-        if self.crouching:
-            self.canvas.create_rectangle(x + 12, y + 12, x + 52, y + 34, fill=base, outline=dark, width=2)
-            self.canvas.create_oval(x + 40, y + 6, x + 58, y + 22, fill=base, outline=dark, width=2)
-            self.canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
+    def draw_player_default(self, x: float, y: float, base: str, dark: str, crouching: bool = False, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
+        if crouching:
+            canvas.create_rectangle(x + 12, y + 12, x + 52, y + 34, fill=base, outline=dark, width=2)
+            canvas.create_oval(x + 40, y + 6, x + 58, y + 22, fill=base, outline=dark, width=2)
+            canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
         else:
-            self.canvas.create_rectangle(x + 12, y + 12, x + 48, y + 42, fill=base, outline=dark, width=2)
-            self.canvas.create_oval(x + 34, y + 4, x + 58, y + 24, fill=base, outline=dark, width=2)
-            self.canvas.create_polygon(x + 6, y + 22, x + 14, y + 26, x + 8, y + 34, fill=base, outline=dark, width=2)
-            self.canvas.create_rectangle(x + 20, y + 42, x + 28, y + 50, fill=base, outline=dark)
-            self.canvas.create_rectangle(x + 34, y + 42, x + 42, y + 50, fill=base, outline=dark)
-            self.canvas.create_oval(x + 48, y + 14, x + 52, y + 18, fill="#0f172a", outline="")
-
-    def draw_player_cr7(self, x: float, y: float) -> None:
+            canvas.create_rectangle(x + 12, y + 12, x + 48, y + 42, fill=base, outline=dark, width=2)
+            canvas.create_oval(x + 34, y + 4, x + 58, y + 24, fill=base, outline=dark, width=2)
+            canvas.create_polygon(x + 6, y + 22, x + 14, y + 26, x + 8, y + 34, fill=base, outline=dark, width=2)
+            canvas.create_rectangle(x + 20, y + 42, x + 28, y + 50, fill=base, outline=dark)
+            canvas.create_rectangle(x + 34, y + 42, x + 42, y + 50, fill=base, outline=dark)
+            canvas.create_oval(x + 48, y + 14, x + 52, y + 18, fill="#0f172a", outline="")
+
+    def draw_player_cr7(self, x: float, y: float, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
         # Dinosaurio inspirado en uniforme de la selección portuguesa
         shirt = "#dc2626"
         stripe = "#16a34a"
@@ -682,16 +720,17 @@ class DinoRunner:
         shorts = "#14532d"
         skin = "#f59e0b"
 
-        self.canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
-        self.canvas.create_rectangle(x + 28, y + 12, x + 36, y + 40, fill=stripe, outline="")
-        self.canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline=detail, width=2)
-        self.canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline=detail)
-        self.canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline=detail)
-        self.canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline=detail)
-        self.canvas.create_text(x + 30, y + 26, text="7", fill="#facc15", font=("Segoe UI", 12, "bold"))
-        self.canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
-
-    def draw_player_messi(self, x: float, y: float) -> None:
+        canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
+        canvas.create_rectangle(x + 28, y + 12, x + 36, y + 40, fill=stripe, outline="")
+        canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline=detail, width=2)
+        canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline=detail)
+        canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline=detail)
+        canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline=detail)
+        canvas.create_text(x + 30, y + 26, text="7", fill="#facc15", font=self.assets.font(12))
+        canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
+
+    def draw_player_messi(self, x: float, y: float, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
         # Dinosaurio con uniforme inspirado en Messi
         shirt = "#60a5fa"
         stripe = "#e0f2fe"
@@ -699,33 +738,35 @@ class DinoRunner:
         shorts = "#1e3a8a"
         skin = "#f59e0b"
 
-        self.canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
-        self.canvas.create_rectangle(x + 18, y + 12, x + 24, y + 40, fill=stripe, outline="")
-        self.canvas.create_rectangle(x + 30, y + 12, x + 36, y + 40, fill=stripe, outline="")
-        self.canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline=detail, width=2)
-        self.canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline=detail)
-        self.canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline=detail)
-        self.canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline=detail)
-        self.canvas.create_text(x + 30, y + 26, text="10", fill="#111827", font=("Segoe UI", 10, "bold"))
-        self.canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
-
-    def draw_player_neymar(self, x: float, y: float) -> None:
+        canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
+        canvas.create_rectangle(x + 18, y + 12, x + 24, y + 40, fill=stripe, outline="")
+        canvas.create_rectangle(x + 30, y + 12, x + 36, y + 40, fill=stripe, outline="")
+        canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline=detail, width=2)
+        canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline=detail)
+        canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline=detail)
+        canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline=detail)
+        canvas.create_text(x + 30, y + 26, text="10", fill="#111827", font=self.assets.font(10))
+        canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
+
+    def draw_player_neymar(self, x: float, y: float, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
         # Dinosaurio con uniforme inspirado en Brasil
         shirt = "#facc15"
         detail = "#166534"
         shorts = "#1d4ed8"
         skin = "#f59e0b"
 
-        self.canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
-        self.canvas.create_polygon(x + 30, y + 18, x + 36, y + 26, x + 30, y + 34, x + 24, y + 26, fill="#2563eb", outline="")
-        self.canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline="#111827", width=2)
-        self.canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline="#111827")
-        self.canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline="#111827")
-        self.canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline="#111827")
-        self.canvas.create_text(x + 30, y + 26, text="10", fill="#111827", font=("Segoe UI", 10, "bold"))
-        self.canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
-
-    def draw_player_infernal(self, x: float, y: float) -> None:
+        canvas.create_rectangle(x + 10, y + 12, x + 50, y + 40, fill=shirt, outline=detail, width=2)
+        canvas.create_polygon(x + 30, y + 18, x + 36, y + 26, x + 30, y + 34, x + 24, y + 26, fill="#2563eb", outline="")
+        canvas.create_oval(x + 33, y + 3, x + 60, y + 24, fill=skin, outline="#111827", width=2)
+        canvas.create_rectangle(x + 18, y + 40, x + 42, y + 50, fill=shorts, outline="#111827")
+        canvas.create_rectangle(x + 20, y + 50, x + 27, y + 58, fill=shirt, outline="#111827")
+        canvas.create_rectangle(x + 34, y + 50, x + 41, y + 58, fill=shirt, outline="#111827")
+        canvas.create_text(x + 30, y + 26, text="10", fill="#111827", font=self.assets.font(10))
+        canvas.create_oval(x + 50, y + 13, x + 54, y + 17, fill="#0f172a", outline="")
+
+    def draw_player_infernal(self, x: float, y: float, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
         # Inspirado en una silueta de dragon volador (sin cambiar escala del personaje)
         wing_fill = "#c2410c"
         wing_dark = "#7c2d12"
@@ -735,127 +776,161 @@ class DinoRunner:
         horn = "#fbbf24"
 
         # Alas extendidas (compactas para mantenerse en el bounding actual)
-        self.canvas.create_polygon(x + 8, y + 20, x + 24, y + 8, x + 30, y + 24, x + 16, y + 30, fill=wing_fill, outline=wing_dark, width=2)
-        self.canvas.create_polygon(x + 30, y + 24, x + 52, y + 10, x + 56, y + 26, x + 40, y + 34, fill=wing_fill, outline=wing_dark, width=2)
-        self.canvas.create_polygon(x + 17, y + 24, x + 24, y + 14, x + 28, y + 24, x + 20, y + 28, fill=membrane, outline="")
-        self.canvas.create_polygon(x + 39, y + 24, x + 47, y + 15, x + 50, y + 27, x + 42, y + 32, fill=membrane, outline="")
+        canvas.create_polygon(x + 8, y + 20, x + 24, y + 8, x + 30, y + 24, x + 16, y + 30, fill=wing_fill, outline=wing_dark, width=2)
+        canvas.create_polygon(x + 30, y + 24, x + 52, y + 10, x + 56, y + 26, x + 40, y + 34, fill=wing_fill, outline=wing_dark, width=2)
+        canvas.create_polygon(x + 17, y + 24, x + 24, y + 14, x + 28, y + 24, x + 20, y + 28, fill=membrane, outline="")
+        canvas.create_polygon(x + 39, y + 24, x + 47, y + 15, x + 50, y + 27, x + 42, y + 32, fill=membrane, outline="")
 
         # Cuerpo/cabeza
-        self.canvas.create_oval(x + 20, y + 20, x + 42, y + 42, fill=body_fill, outline=body_dark, width=2)
-        self.canvas.create_oval(x + 34, y + 24, x + 54, y + 42, fill=body_fill, outline=body_dark, width=2)
+        canvas.create_oval(x + 20, y + 20, x + 42, y + 42, fill=body_fill, outline=body_dark, width=2)
+        canvas.create_oval(x + 34, y + 24, x + 54, y + 42, fill=body_fill, outline=body_dark, width=2)
 
         # Cuernos y brillo ocular
-        self.canvas.create_polygon(x + 41, y + 22, x + 45, y + 15, x + 47, y + 23, fill=horn, outline="")
-        self.canvas.create_polygon(x + 47, y + 23, x + 51, y + 17, x + 52, y + 25, fill=horn, outline="")
-        self.canvas.create_oval(x + 49, y + 31, x + 52, y + 34, fill="#34d399", outline="")
+        canvas.create_polygon(x + 41, y + 22, x + 45, y + 15, x + 47, y + 23, fill=horn, outline="")
+        canvas.create_polygon(x + 47, y + 23, x + 51, y + 17, x + 52, y + 25, fill=horn, outline="")
+        canvas.create_oval(x + 49, y + 31, x + 52, y + 34, fill="#34d399", outline="")
 
         # Cola/espinas
-        self.canvas.create_polygon(x + 20, y + 34, x + 12, y + 38, x + 22, y + 39, fill=body_fill, outline=body_dark, width=1)
+        canvas.create_polygon(x + 20, y + 34, x + 12, y + 38, x + 22, y + 39, fill=body_fill, outline=body_dark, width=1)
         for i in range(4):
             sx = x + 26 + i * 3
-            self.canvas.create_polygon(sx, y + 20 - i, sx + 2, y + 15 - i, sx + 3, y + 20 - i, fill=horn, outline="")
-
-    def draw_player(self) -> None:
-        x = self.player_x
-        y = self.player_y
-        if self.equipped_skin == "cr7":
-            self.draw_player_cr7(x, y)
-        elif self.equipped_skin == "infernal":
-            self.draw_player_infernal(x, y)
-        elif self.equipped_skin == "messi":
-            self.draw_player_messi(x, y)
-        elif self.equipped_skin == "neymar":
-            self.draw_player_neymar(x, y)
+            canvas.create_polygon(sx, y + 20 - i, sx + 2, y + 15 - i, sx + 3, y + 20 - i, fill=horn, outline="")
+
+    def draw_player_skin(self, key: str, x: float, y: float, crouching: bool, surface: SpriteCanvas | None = None) -> None:
+        if key == "cr7":
+            self.draw_player_cr7(x, y, surface)
+        elif key == "infernal":
+            self.draw_player_infernal(x, y, surface)
+        elif key == "messi":
+            self.draw_player_messi(x, y, surface)
+        elif key == "neymar":
+            self.draw_player_neymar(x, y, surface)
         else:
-            skin = self.skins[self.equipped_skin]
-            self.draw_player_default(x, y, str(skin["base"]), str(skin["dark"]))
-
-    def draw_bird(self, x: float, y: float) -> None:
-        wing_up = int((x // 14) % 2 == 0)
-        self.canvas.create_oval(x + 20, y + 8, x + 66, y + 36, fill="#f59e0b", outline="")
-        self.canvas.create_polygon(x + 20, y + 20, x - 4, y + 24, x + 20, y + 29, fill="#fde68a", outline="")
-        wing = [x + 42, y + 18, x + 70, y - 10, x + 36, y + 23] if wing_up else [x + 42, y + 22, x + 72, y + 40, x + 32, y + 28]
-        self.canvas.create_polygon(wing, fill="#fbbf24", outline="")
-        self.canvas.create_oval(x + 26, y + 14, x + 30, y + 18, fill="#0f172a", outline="")
-
-    def draw_emiliano_coin(self, x: float, y: float, r: float) -> None:
-        self.canvas.create_oval(x, y, x + 2 * r, y + 2 * r, fill="#facc15", outline="#a16207", width=2)
-        self.canvas.create_oval(x + 4, y + 4, x + 2 * r - 4, y + 2 * r - 4, fill="#fbbf24", outline="#d97706", width=1)
+            skin = self.skins[key]
+            self.draw_player_default(x, y, str(skin["base"]), str(skin["dark"]), crouching, surface)
+
+    def sprite_frame(self, key: tuple) -> tuple[int, int, int, int]:
+        # (ancho, alto, origen_x, origen_y) del PhotoImage de cada tipo de sprite. El
+        # último elemento de la clave dice si se hornea con bordes (según la calidad).
+        if key[0] == "player":
+            return 64, 62, 0, 0
+        if key[0] == "bird":
+            return 80, 54, 6, 12
+        size = int(2 * key[1]) + 4
+        return size, size, 2, 2
+
+    def bake_sprite(self, key: tuple) -> tk.PhotoImage:
+        width, height, ox, oy = self.sprite_frame(key)
+        surface = SpriteCanvas(width, height, outlines=key[-1])
+        if key[0] == "player":
+            self.draw_player_skin(key[1], ox, oy, key[2], surface)
+        elif key[0] == "bird":
+            self.draw_bird(ox, oy, key[1], surface)
+        else:
+            self.draw_emiliano_coin(ox, oy, key[1], surface)
+        return surface.to_photo(self.root)
+
+    def create_sprite(self, key: tuple, x: float, y: float, tags: str | tuple[str, ...] = ()) -> int:
+        _, _, ox, oy = self.sprite_frame(key)
+        return self.canvas.create_image(x - ox, y - oy, image=self.sprites.get(key), anchor="nw", tags=tags)
+
+    def bird_wing_up(self, x: float) -> bool:
+        return (x // 14) % 2 == 0
+
+    def bird_wing_coords(self, x: float, y: float, wing_up: bool) -> list[float]:
+        if wing_up:
+            return [x + 42, y + 18, x + 70, y - 10, x + 36, y + 23]
+        return [x + 42, y + 22, x + 72, y + 40, x + 32, y + 28]
+
+    def draw_bird(self, x: float, y: float, wing_up: bool, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
+        canvas.create_oval(x + 20, y + 8, x + 66, y + 36, fill="#f59e0b", outline="")
+        canvas.create_polygon(x + 20, y + 20, x - 4, y + 24, x + 20, y + 29, fill="#fde68a", outline="")
+        wing = self.bird_wing_coords(x, y, wing_up)
+        canvas.create_polygon(wing, fill="#fbbf24", outline="")
+        canvas.create_oval(x + 26, y + 14, x + 30, y + 18, fill="#0f172a", outline="")
+
+    def draw_emiliano_coin(self, x: float, y: float, r: float, surface: SpriteCanvas | None = None) -> None:
+        canvas = surface or self.canvas
+        canvas.create_oval(x, y, x + 2 * r, y + 2 * r, fill="#facc15", outline="#a16207", width=2)
+        canvas.create_oval(x + 4, y + 4, x + 2 * r - 4, y + 2 * r - 4, fill="#fbbf24", outline="#d97706", width=1)
         cx = x + r
         cy = y + r
-        self.canvas.create_oval(cx - 4, cy - 12, cx + 4, cy - 4, fill="#92400e", outline="")
-        self.canvas.create_line(cx, cy - 4, cx + 3, cy + 10, fill="#92400e", width=2)
-        self.canvas.create_text(cx - 7, cy - 1, text="E", fill="#92400e", font=("Segoe UI", 9, "bold"))
+        canvas.create_oval(cx - 4, cy - 12, cx + 4, cy - 4, fill="#92400e", outline="")
+        canvas.create_line(cx, cy - 4, cx + 3, cy + 10, fill="#92400e", width=2)
+        canvas.create_text(cx - 7, cy - 1, text="E", fill="#92400e", font=self.assets.font(9))
 
     def is_day_sky(self) -> bool:
-        return (self.score // SKY_SWITCH_POINTS) % 2 == 0
+        return (self.sim.score // SKY_SWITCH_POINTS) % 2 == 0
 
-    def draw_day_sky(self) -> None:
-        self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#38bdf8", outline="")
+    def draw_day_sky(self, tags: str | tuple[str, ...] = ()) -> None:
+        self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#38bdf8", outline="", tags=tags)
 
         # Sol con brillo
         sx, sy = self.game_width * 0.78, self.game_height * 0.2
         for r, c in [(90, "#bfdbfe"), (70, "#dbeafe"), (45, "#ffffff")]:
-            self.canvas.create_oval(sx - r, sy - r, sx + r, sy + r, fill=c, outline="")
+            self.canvas.create_oval(sx - r, sy - r, sx + r, sy + r, fill=c, outline="", tags=tags)
 
+        settings = self.quality.settings
         # Rayos
-        for dx, dy in [(130, 0), (0, 130), (92, 92), (92, -92), (-130, 0), (0, -130), (-92, -92), (-92, 92)]:
-            self.canvas.create_line(sx, sy, sx + dx, sy + dy, fill="#e0f2fe", width=2)
+        if settings["sun_rays"]:
+            for dx, dy in [(130, 0), (0, 130), (92, 92), (92, -92), (-130, 0), (0, -130), (-92, -92), (-92, 92)]:
+                self.canvas.create_line(sx, sy, sx + dx, sy + dy, fill="#e0f2fe", width=2, tags=tags)
 
         # Nubes
-        clouds = [(160, 95, 70), (300, 150, 80), (520, 90, 60), (760, 170, 85)]
+        clouds = [(160, 95, 70), (300, 150, 80), (520, 90, 60), (760, 170, 85)] if settings["clouds"] else []
         for cx, cy, r in clouds:
-            self.canvas.create_oval(cx - r, cy - r * 0.55, cx + r, cy + r * 0.55, fill="#f8fafc", outline="")
-            self.canvas.create_oval(cx - r * 0.6, cy - r * 0.7, cx + r * 0.2, cy + r * 0.25, fill="#f8fafc", outline="")
-            self.canvas.create_oval(cx - r * 0.1, cy - r * 0.75, cx + r * 0.7, cy + r * 0.25, fill="#f8fafc", outline="")
+            self.canvas.create_oval(cx - r, cy - r * 0.55, cx + r, cy + r * 0.55, fill="#f8fafc", outline="", tags=tags)
+            self.canvas.create_oval(cx - r * 0.6, cy - r * 0.7, cx + r * 0.2, cy + r * 0.25, fill="#f8fafc", outline="", tags=tags)
+            self.canvas.create_oval(cx - r * 0.1, cy - r * 0.75, cx + r * 0.7, cy + r * 0.25, fill="#f8fafc", outline="", tags=tags)
 
-    def draw_night_sky(self) -> None:
-        self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#0f172a", outline="")
+    def draw_night_sky(self, tags: str | tuple[str, ...] = ()) -> None:
+        self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#0f172a", outline="", tags=tags)
 
         # Estrellas
-        for i in range(120):
+        for i in range(int(self.quality.settings["stars"])):
             x = (i * 97) % int(self.game_width)
             y = (i * 53) % int(max(1, self.ground_y - 20))
             size = 2 if i % 3 == 0 else 1
-            self.canvas.create_oval(x, y, x + size, y + size, fill="#e2e8f0", outline="")
+            self.canvas.create_oval(x, y, x + size, y + size, fill="#e2e8f0", outline="", tags=tags)
 
         # Luna
         mx, my = self.game_width * 0.8, self.game_height * 0.2
-        self.canvas.create_oval(mx - 55, my - 55, mx + 55, my + 55, fill="#e2e8f0", outline="")
-        self.canvas.create_oval(mx - 42, my - 42, mx + 42, my + 42, fill="#f8fafc", outline="")
+        self.canvas.create_oval(mx - 55, my - 55, mx + 55, my + 55, fill="#e2e8f0", outline="", tags=tags)
+        self.canvas.create_oval(mx - 42, my - 42, mx + 42, my + 42, fill="#f8fafc", outline="", tags=tags)
 
-    def draw_dynamic_sky(self) -> None:
+    def draw_dynamic_sky(self, tags: str | tuple[str, ...] = ()) -> None:
         if self.is_day_sky():
-            self.draw_day_sky()
+            self.draw_day_sky(tags=tags)
         else:
-            self.draw_night_sky()
+            self.draw_night_sky(tags=tags)
 
-    def draw_ground(self) -> None:
-        self.canvas.create_rectangle(0, self.ground_y, self.game_width, self.game_height, fill="#14532d", outline="")
-        self.canvas.create_line(0, self.ground_y, self.game_width, self.ground_y, fill="#22c55e", width=3)
+    def draw_ground(self, tags: str | tuple[str, ...] = ()) -> None:
+        self.canvas.create_rectangle(0, self.ground_y, self.game_width, self.game_height, fill="#14532d", outline="", tags=tags)
+        self.canvas.create_line(0, self.ground_y, self.game_width, self.ground_y, fill="#22c55e", width=3, tags=tags)
 
-    def draw_grass_tuft(self, x: float, y: float, size: float) -> None:
+    def draw_grass_tuft(self, x: float, y: float, size: float, tags: str | tuple[str, ...] = ()) -> None:
         dark = "#166534"
         light = "#4ade80"
-        self.canvas.create_polygon(x, y, x + size * 0.18, y - size * 0.95, x + size * 0.36, y, fill=dark, outline="#052e16", width=1)
-        self.canvas.create_polygon(x + size * 0.22, y, x + size * 0.46, y - size * 1.15, x + size * 0.68, y, fill=dark, outline="#052e16", width=1)
-        self.canvas.create_polygon(x + size * 0.52, y, x + size * 0.72, y - size * 0.85, x + size * 0.94, y, fill=dark, outline="#052e16", width=1)
-        self.canvas.create_polygon(x + size * 0.28, y - size * 0.08, x + size * 0.42, y - size * 0.82, x + size * 0.52, y - size * 0.08, fill=light, outline="")
-
-    def draw_grass_decor(self) -> None:
-        spacing = 145
-        phase = int(self.score * 0.9) % spacing
+        self.canvas.create_polygon(x, y, x + size * 0.18, y - size * 0.95, x + size * 0.36, y, fill=dark, outline="#052e16", width=1, tags=tags)
+        self.canvas.create_polygon(x + size * 0.22, y, x + size * 0.46, y - size * 1.15, x + size * 0.68, y, fill=dark, outline="#052e16", width=1, tags=tags)
+        self.canvas.create_polygon(x + size * 0.52, y, x + size * 0.72, y - size * 0.85, x + size * 0.94, y, fill=dark, outline="#052e16", width=1, tags=tags)
+        self.canvas.create_polygon(x + size * 0.28, y - size * 0.08, x + size * 0.42, y - size * 0.82, x + size * 0.52, y - size * 0.08, fill=light, outline="", tags=tags)
+
+    def draw_grass_decor(self, tags: str | tuple[str, ...] = ()) -> None:
+        spacing = GRASS_SPACING
+        phase = int(self.sim.score * 0.9) % spacing
         for i in range(-1, int(self.game_width / spacing) + 2):
             x = i * spacing - phase
-            if ((i * 31) + int(self.score / 18)) % 4 != 0:
+            if ((i * 31) + int(self.sim.score / 18)) % 4 != 0:
                 continue
             size = 42 if i % 2 == 0 else 34
-            self.draw_grass_tuft(x + 20, self.ground_y + 6, size)
+            self.draw_grass_tuft(x + 20, self.ground_y + 6, size, tags)
 
     def button(self, x: float, y: float, w: float, h: float, text: str, action: str, fill: str, text_color: str = "#111") -> None:
         self.buttons.append((x, y, x + w, y + h, action))
         self.canvas.create_rectangle(x, y, x + w, y + h, fill=fill, outline="#111827", width=2)
-        self.canvas.create_text(x + w / 2, y + h / 2, text=text, fill=text_color, font=("Segoe UI", 20, "bold"))
+        self.canvas.create_text(x + w / 2, y + h / 2, text=text, fill=text_color, font=self.assets.font(20))
 
     def draw_login_screen(self) -> None:
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#060b34", width=0)
@@ -875,23 +950,23 @@ class DinoRunner:
         self.canvas.create_oval(cx - 26, y1 + 52, cx + 26, y1 + 100, fill="#e2e8f0", outline="")
         self.canvas.create_rectangle(cx - 34, y1 + 96, cx + 34, y1 + 132, fill="#e2e8f0", outline="")
 
-        self.canvas.create_text(cx, y1 + 188, text="Iniciar sesión", fill="#e2e8f0", font=("Segoe UI", 42, "bold"))
-        self.canvas.create_text(cx, y1 + 220, text="Tu progreso de Emilianos y skins se guardará por cuenta", fill="#93c5fd", font=("Segoe UI", 16, "bold"))
+        self.canvas.create_text(cx, y1 + 188, text="Iniciar sesión", fill="#e2e8f0", font=self.assets.font(42))
+        self.canvas.create_text(cx, y1 + 220, text="Tu progreso de Emilianos y skins se guardará por cuenta", fill="#93c5fd", font=self.assets.font(16))
 
-        self.canvas.create_text(cx - 280, y1 + 328, text="👤", fill="#1e3a5f", font=("Segoe UI", 18, "bold"), anchor="w")
-        self.canvas.create_text(cx - 246, y1 + 328, text="Username", fill="#64748b", font=("Segoe UI", 15), anchor="w")
+        self.canvas.create_text(cx - 280, y1 + 328, text="👤", fill="#1e3a5f", font=self.assets.font(18), anchor="w")
+        self.canvas.create_text(cx - 246, y1 + 328, text="Username", fill="#64748b", font=self.assets.font(15, "normal"), anchor="w")
 
-        self.canvas.create_text(cx - 280, y1 + 400, text="🔒", fill="#1e3a5f", font=("Segoe UI", 18, "bold"), anchor="w")
-        self.canvas.create_text(cx - 246, y1 + 400, text="Password", fill="#64748b", font=("Segoe UI", 15), anchor="w")
+        self.canvas.create_text(cx - 280, y1 + 400, text="🔒", fill="#1e3a5f", font=self.assets.font(18), anchor="w")
+        self.canvas.create_text(cx - 246, y1 + 400, text="Password", fill="#64748b", font=self.assets.font(15, "normal"), anchor="w")
 
-        self.canvas.create_text(cx - 195, y1 + 441, text="¿Te olvidaste de la contraseña?", fill="#93c5fd", font=("Segoe UI", 14, "underline"), anchor="w")
+        self.canvas.create_text(cx - 195, y1 + 441, text="¿Te olvidaste de la contraseña?", fill="#93c5fd", font=self.assets.font(14, "underline"), anchor="w")
         self.buttons.append((cx - 195, y1 + 430, cx + 120, y1 + 452, "open_recover"))
-        self.canvas.create_text(cx + 195, y1 + 441, text="Registrarse", fill="#93c5fd", font=("Segoe UI", 14, "underline"), anchor="e")
+        self.canvas.create_text(cx + 195, y1 + 441, text="Registrarse", fill="#93c5fd", font=self.assets.font(14, "underline"), anchor="e")
         self.buttons.append((cx + 95, y1 + 430, cx + 195, y1 + 452, "open_register"))
 
         status = self.login_status_var.get().strip()
         if status:
-            self.canvas.create_text(cx, y1 + 468, text=status, fill="#fca5a5", font=("Segoe UI", 14, "bold"))
+            self.canvas.create_text(cx, y1 + 468, text=status, fill="#fca5a5", font=self.assets.font(14))
 
         self.button(cx - 170, y1 + 478, 340, 56, "Entrar", "login", "#22c55e")
 
@@ -905,16 +980,16 @@ class DinoRunner:
 
         self.canvas.create_rectangle(x1, y1, x2, y1 + card_h, fill="#0b1120", outline="#334155", width=3)
         cx = self.game_width / 2
-        self.canvas.create_text(cx, y1 + 76, text="Crear cuenta", fill="#e2e8f0", font=("Segoe UI", 40, "bold"))
+        self.canvas.create_text(cx, y1 + 76, text="Crear cuenta", fill="#e2e8f0", font=self.assets.font(40))
 
-        self.canvas.create_text(cx, y1 + 176, text="Nombre de usuario", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 248, text="Correo electrónico", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 320, text="Contraseña", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 392, text="Confirmar contraseña", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
+        self.canvas.create_text(cx, y1 + 176, text="Nombre de usuario", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 248, text="Correo electrónico", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 320, text="Contraseña", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 392, text="Confirmar contraseña", fill="#cbd5e1", font=self.assets.font(16))
 
         status = self.register_status_var.get().strip()
         if status:
-            self.canvas.create_text(cx, y1 + 426, text=status, fill="#fca5a5", font=("Segoe UI", 14, "bold"))
+            self.canvas.create_text(cx, y1 + 426, text=status, fill="#fca5a5", font=self.assets.font(14))
 
         self.button(cx - 170, y1 + 448, 340, 46, "Crear cuenta", "register", "#22c55e")
         self.button(cx - 170, y1 + 498, 340, 38, "Volver al login", "back_login_from_register", "#a78bfa")
@@ -929,17 +1004,17 @@ class DinoRunner:
 
         self.canvas.create_rectangle(x1, y1, x2, y1 + card_h, fill="#0b1120", outline="#334155", width=3)
         cx = self.game_width / 2
-        self.canvas.create_text(cx, y1 + 62, text="Recuperar contraseña", fill="#e2e8f0", font=("Segoe UI", 38, "bold"))
-        self.canvas.create_text(cx, y1 + 110, text="Ingresa tu correo, verifica código y define nueva contraseña", fill="#93c5fd", font=("Segoe UI", 15, "bold"))
+        self.canvas.create_text(cx, y1 + 62, text="Recuperar contraseña", fill="#e2e8f0", font=self.assets.font(38))
+        self.canvas.create_text(cx, y1 + 110, text="Ingresa tu correo, verifica código y define nueva contraseña", fill="#93c5fd", font=self.assets.font(15))
 
-        self.canvas.create_text(cx, y1 + 198, text="Correo electrónico", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 270, text="Código recibido", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 342, text="Nueva contraseña", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(cx, y1 + 414, text="Confirmar contraseña", fill="#cbd5e1", font=("Segoe UI", 16, "bold"))
+        self.canvas.create_text(cx, y1 + 198, text="Correo electrónico", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 270, text="Código recibido", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 342, text="Nueva contraseña", fill="#cbd5e1", font=self.assets.font(16))
+        self.canvas.create_text(cx, y1 + 414, text="Confirmar contraseña", fill="#cbd5e1", font=self.assets.font(16))
 
         status = self.recover_status_var.get().strip()
         if status:
-            self.canvas.create_text(cx, y1 + 452, text=status, fill="#facc15", font=("Segoe UI", 13, "bold"))
+            self.canvas.create_text(cx, y1 + 452, text=status, fill="#facc15", font=self.assets.font(13))
 
         self.button(cx - 170, y1 + 480, 340, 42, "Enviar código", "send_recovery", "#22c55e")
         self.button(cx - 170, y1 + 526, 340, 42, "Verificar código", "verify_recovery", "#38bdf8")
@@ -948,26 +1023,53 @@ class DinoRunner:
 
     def draw_main_menu(self) -> None:
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#0b1120", width=0)
-        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 140, text="Modern Dinosaur Game", fill="#e2e8f0", font=("Segoe UI", 42, "bold"))
+        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 140, text="Modern Dinosaur Game", fill="#e2e8f0", font=self.assets.font(42))
         if self.current_user:
-            self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 95, text=f"Cuenta: {self.current_user}", fill="#93c5fd", font=("Segoe UI", 18, "bold"))
+            self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 95, text=f"Cuenta: {self.current_user}", fill="#93c5fd", font=self.assets.font(18))
         cx = self.game_width / 2 - 130
-        self.button(cx, self.game_height / 2 - 20, 260, 62, "Jugar", "play", "#22c55e")
-        self.button(cx, self.game_height / 2 + 60, 260, 62, "Tienda", "open_shop", "#f59e0b")
-        self.button(cx, self.game_height / 2 + 140, 260, 62, "Skins", "open_skins", "#60a5fa")
-        self.button(cx, self.game_height / 2 + 220, 260, 62, "Salir", "exit", "#ef4444")
+        self.button(cx, self.game_height / 2 - 50, 260, 54, "Jugar", "play", "#22c55e")
+        self.button(cx, self.game_height / 2 + 18, 260, 54, "Tienda", "open_shop", "#f59e0b")
+        self.button(cx, self.game_height / 2 + 86, 260, 54, "Skins", "open_skins", "#60a5fa")
+        self.button(cx, self.game_height / 2 + 154, 260, 54, "Ranking", "open_leaderboard", "#2dd4bf")
+        self.button(cx, self.game_height / 2 + 222, 260, 54, "Salir", "exit", "#ef4444")
+
+    def draw_leaderboard(self) -> None:
+        self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#0b1120", width=0)
+        self.canvas.create_text(self.game_width / 2, 70, text="Ranking", fill="#e2e8f0", font=self.assets.font(40))
+        total = len(self.leaderboard)
+        self.canvas.create_text(self.game_width / 2, 108, text=f"{total} jugadores con récord", fill="#93c5fd", font=self.assets.font(16))
+
+        rows = self.leaderboard.top(LEADERBOARD_ROWS)
+        row_h = 36
+        x1 = self.game_width / 2 - 300
+        x2 = self.game_width / 2 + 300
+        y = 140
+        for rank, user, best in rows:
+            mine = user == self.current_user
+            self.canvas.create_rectangle(x1, y, x2, y + row_h - 4, fill="#1e293b" if mine else "#111827", outline="#fbbf24" if mine else "#334155", width=2)
+            self.canvas.create_text(x1 + 40, y + row_h / 2 - 2, text=f"#{rank}", fill="#fbbf24" if rank <= 3 else "#cbd5e1", font=self.assets.font(16))
+            self.canvas.create_text(x1 + 90, y + row_h / 2 - 2, text=user, anchor="w", fill="#e2e8f0", font=self.assets.font(16))
+            self.canvas.create_text(x2 - 24, y + row_h / 2 - 2, text=str(best), anchor="e", fill="#a5b4fc", font=self.assets.font(16))
+            y += row_h
+        if not rows:
+            self.canvas.create_text(self.game_width / 2, y + 40, text="Todavía no hay récords", fill="#94a3b8", font=self.assets.font(18))
+
+        my_rank = self.leaderboard.rank(self.current_user)
+        mine = f"Tu posición: #{my_rank} de {total} ({self.best_score})" if my_rank else "Aún no tienes récord: juega una partida"
+        self.canvas.create_text(self.game_width / 2, self.game_height - 130, text=mine, fill="#facc15", font=self.assets.font(20))
+        self.button(40, self.game_height - 90, 220, 52, "Volver al menú", "back_menu", "#a78bfa")
 
     def draw_shop(self) -> None:
         # Fondo inspirado en la fachada y separador central
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#121212", width=0)
         self.canvas.create_rectangle(0, 0, self.game_width, 100, fill="#1f2937", width=0)
-        self.canvas.create_text(self.game_width / 2, 50, text="MERCADONA SHOP", fill="#22c55e", font=("Segoe UI", 36, "bold"))
+        self.canvas.create_text(self.game_width / 2, 50, text="MERCADONA SHOP", fill="#22c55e", font=self.assets.font(36))
         self.draw_shop_logo(110, 50, 36)
         self.draw_shop_logo(self.game_width - 110, 50, 36)
         self.canvas.create_rectangle(self.game_width / 2 - 20, 100, self.game_width / 2 + 20, self.game_height, fill="#6b7280", width=0)
 
-        self.canvas.create_text(self.game_width / 4, 120, text="Lado izquierdo", fill="#d1d5db", font=("Segoe UI", 16, "bold"))
-        self.canvas.create_text(self.game_width * 3 / 4, 120, text="Lado derecho", fill="#d1d5db", font=("Segoe UI", 16, "bold"))
+        self.canvas.create_text(self.game_width / 4, 120, text="Lado izquierdo", fill="#d1d5db", font=self.assets.font(16))
+        self.canvas.create_text(self.game_width * 3 / 4, 120, text="Lado derecho", fill="#d1d5db", font=self.assets.font(16))
 
         # Skins disponibles (solo las definidas en self.skins)
         left_keys = ["default", "infernal"]
@@ -995,10 +1097,7 @@ class DinoRunner:
 
     def draw_skin_preview(self, key: str, x: float, y: float) -> None:
         # Mini preview entre nombre y coste para facilitar compra
-        if key == "infernal":
-            self.draw_player_infernal(x + 8, y + 3)
-        else:
-            self.draw_player_default(x + 8, y + 3)
+        self.create_sprite(("player", key, False, True), x + 8, y + 3)
 
     def draw_skin_cards(self, keys: list[str], start_x: float, start_y: float) -> None:
         y = start_y
@@ -1007,14 +1106,14 @@ class DinoRunner:
             owned = bool(skin["owned"])
             cost = int(skin["cost"])
             self.canvas.create_rectangle(start_x, y, start_x + 470, y + 130, fill="#1f2937", outline="#374151", width=2)
-            self.canvas.create_text(start_x + 18, y + 22, anchor="w", text=skin["name"], fill="#e5e7eb", font=("Segoe UI", 18, "bold"))
+            self.canvas.create_text(start_x + 18, y + 22, anchor="w", text=skin["name"], fill="#e5e7eb", font=self.assets.font(18))
 
             preview_x = start_x + 22
             preview_y = y + 36
             self.canvas.create_rectangle(preview_x, preview_y, preview_x + 74, preview_y + 56, fill="#111827", outline="#334155", width=2)
             self.draw_skin_preview(key, preview_x, preview_y)
 
-            self.canvas.create_text(start_x + 18, y + 112, anchor="w", text=f"Coste: {cost} Emilianos", fill="#fbbf24", font=("Segoe UI", 14, "bold"))
+            self.canvas.create_text(start_x + 18, y + 112, anchor="w", text=f"Coste: {cost} Emilianos", fill="#fbbf24", font=self.assets.font(14))
 
             if self.equipped_skin == key:
                 label = "Usando"
@@ -1027,8 +1126,8 @@ class DinoRunner:
 
     def draw_skins_menu(self) -> None:
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#0b1120", width=0)
-        self.canvas.create_text(self.game_width / 2, 70, text="Skins", fill="#e2e8f0", font=("Segoe UI", 40, "bold"))
-        self.canvas.create_text(self.game_width / 2, 108, text="Aquí puedes equipar sin entrar a la tienda", fill="#93c5fd", font=("Segoe UI", 16, "bold"))
+        self.canvas.create_text(self.game_width / 2, 70, text="Skins", fill="#e2e8f0", font=self.assets.font(40))
+        self.canvas.create_text(self.game_width / 2, 108, text="Aquí puedes equipar sin entrar a la tienda", fill="#93c5fd", font=self.assets.font(16))
 
         keys = ["default", "infernal"]
         self.draw_owned_skin_cards(keys, start_x=90, start_y=150)
@@ -1053,7 +1152,7 @@ class DinoRunner:
             owned = bool(skin["owned"])
 
             self.canvas.create_rectangle(x, y, x + card_w, y + card_h, fill="#1f2937", outline="#334155", width=2)
-            self.canvas.create_text(x + 16, y + 24, anchor="w", text=str(skin["name"]), fill="#e5e7eb", font=("Segoe UI", 18, "bold"))
+            self.canvas.create_text(x + 16, y + 24, anchor="w", text=str(skin["name"]), fill="#e5e7eb", font=self.assets.font(18))
 
             preview_x = x + 16
             preview_y = y + 40
@@ -1062,7 +1161,7 @@ class DinoRunner:
 
             status = "Comprada" if owned else "No comprada"
             status_color = "#4ade80" if owned else "#fca5a5"
-            self.canvas.create_text(x + 102, y + 74, anchor="w", text=f"Estado: {status}", fill=status_color, font=("Segoe UI", 14, "bold"))
+            self.canvas.create_text(x + 102, y + 74, anchor="w", text=f"Estado: {status}", fill=status_color, font=self.assets.font(14))
 
             if self.equipped_skin == key:
                 label = "Usando"
@@ -1076,13 +1175,13 @@ class DinoRunner:
 
     def draw_pause_menu(self) -> None:
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#020617", width=0)
-        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 120, text="Juego en pausa", fill="#e2e8f0", font=("Segoe UI", 36, "bold"))
+        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 120, text="Juego en pausa", fill="#e2e8f0", font=self.assets.font(36))
         self.button(self.game_width / 2 - 170, self.game_height / 2 - 20, 340, 64, "Seguir jugando", "continue_play", "#22c55e")
         self.button(self.game_width / 2 - 170, self.game_height / 2 + 70, 340, 64, "Volver al menú", "back_menu", "#a78bfa")
 
     def draw_game_over_menu(self) -> None:
         self.canvas.create_rectangle(0, 0, self.game_width, self.game_height, fill="#020617", width=0)
-        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 120, text="Has perdido", fill="#fb7185", font=("Segoe UI", 36, "bold"))
+        self.canvas.create_text(self.game_width / 2, self.game_height / 2 - 120, text="Has perdido", fill="#fb7185", font=self.assets.font(36))
         self.button(self.game_width / 2 - 170, self.game_height / 2 - 20, 340, 64, "Jugar otra partida", "play_again", "#22c55e")
         self.button(self.game_width / 2 - 170, self.game_height / 2 + 70, 340, 64, "Volver al menú", "back_menu", "#a78bfa")
 
@@ -1090,73 +1189,201 @@ class DinoRunner:
         # Alias para mantener compatibilidad con el nombre esperado por comentarios.
         self.draw_game_over_menu()
 
-    def draw_game(self) -> None:
-        self.draw_dynamic_sky()
-        self.draw_ground()
-        self.draw_player()
-        for coin in self.coins:
-            self.draw_emiliano_coin(coin["x"], coin["y"], coin["r"])
-        for obs in self.obstacles:
-            if obs["type"] == "bird":
-                self.draw_bird(float(obs["x"]), float(obs["y"]))
-            else:
-                x1 = float(obs["x"])
-                y1 = float(obs["y"])
-                x2 = x1 + float(obs["w"])
-                y2 = y1 + float(obs["h"])
-                w = x2 - x1
-                h = y2 - y1
-                cactus_fill = "#84cc16"
-                cactus_dark = "#3f6212"
-
-                # Tronco principal tipo saguaro
-                trunk_x1 = x1 + w * 0.36
-                trunk_x2 = x1 + w * 0.64
-                self.canvas.create_rectangle(trunk_x1, y1, trunk_x2, y2, fill=cactus_fill, outline=cactus_dark, width=2)
-
-                # Brazo izquierdo: segmento horizontal + segmento vertical
-                left_joint_y = y1 + h * 0.40
-                left_arm_h = max(4.0, h * 0.16)
-                self.canvas.create_rectangle(
-                    x1 + w * 0.14,
-                    left_joint_y,
-                    trunk_x1,
-                    left_joint_y + left_arm_h,
-                    fill=cactus_fill,
-                    outline=cactus_dark,
-                    width=2,
-                )
-                self.canvas.create_rectangle(
-                    x1 + w * 0.14,
-                    y1 + h * 0.14,
-                    x1 + w * 0.28,
-                    left_joint_y,
-                    fill=cactus_fill,
-                    outline=cactus_dark,
-                    width=2,
-                )
-
-                # Brazo derecho: segmento horizontal + segmento vertical (más alto)
-                right_joint_y = y1 + h * 0.30
-                right_arm_h = max(4.0, h * 0.16)
-                self.canvas.create_rectangle(
-                    trunk_x2,
-                    right_joint_y,
-                    x1 + w * 0.88,
-                    right_joint_y + right_arm_h,
-                    fill=cactus_fill,
-                    outline=cactus_dark,
-                    width=2,
-                )
-                self.canvas.create_rectangle(
-                    x1 + w * 0.74,
-                    y1 + h * 0.05,
-                    x1 + w * 0.88,
-                    right_joint_y,
-                    fill=cactus_fill,
-                    outline=cactus_dark,
-                    width=2,
-                )
+    def draw_cactus(self, x1: float, y1: float, w: float, h: float, tags: str | tuple[str, ...] = ()) -> None:
+        y2 = y1 + h
+        cactus_fill = "#84cc16"
+        settings = self.quality.settings
+        outline_width = int(settings["outline"])
+        cactus_dark = "#3f6212" if outline_width else ""
+
+        if not settings["cactus_arms"]:
+            # Calidad baja: un solo rectángulo con la caja de colisión
+            self.canvas.create_rectangle(x1, y1, x1 + w, y2, fill=cactus_fill, outline="", tags=tags)
+            return
+
+        # Tronco principal tipo saguaro
+        trunk_x1 = x1 + w * 0.36
+        trunk_x2 = x1 + w * 0.64
+        self.canvas.create_rectangle(trunk_x1, y1, trunk_x2, y2, fill=cactus_fill, outline=cactus_dark, width=outline_width, tags=tags)
+
+        # Brazo izquierdo: segmento horizontal + segmento vertical
+        left_joint_y = y1 + h * 0.40
+        left_arm_h = max(4.0, h * 0.16)
+        self.canvas.create_rectangle(
+            x1 + w * 0.14,
+            left_joint_y,
+            trunk_x1,
+            left_joint_y + left_arm_h,
+            fill=cactus_fill,
+            outline=cactus_dark,
+            width=outline_width,
+            tags=tags,
+        )
+        self.canvas.create_rectangle(
+            x1 + w * 0.14,
+            y1 + h * 0.14,
+            x1 + w * 0.28,
+            left_joint_y,
+            fill=cactus_fill,
+            outline=cactus_dark,
+            width=outline_width,
+            tags=tags,
+        )
+
+        # Brazo derecho: segmento horizontal + segmento vertical (más alto)
+        right_joint_y = y1 + h * 0.30
+        right_arm_h = max(4.0, h * 0.16)
+        self.canvas.create_rectangle(
+            trunk_x2,
+            right_joint_y,
+            x1 + w * 0.88,
+            right_joint_y + right_arm_h,
+            fill=cactus_fill,
+            outline=cactus_dark,
+            width=outline_width,
+            tags=tags,
+        )
+        self.canvas.create_rectangle(
+            x1 + w * 0.74,
+            y1 + h * 0.05,
+            x1 + w * 0.88,
+            right_joint_y,
+            fill=cactus_fill,
+            outline=cactus_dark,
+            width=outline_width,
+            tags=tags,
+        )
+
+    def clear_scene(self) -> None:
+        # El cielo cacheado sobrevive a los menús: solo se oculta
+        self.canvas.delete("!sky")
+        if self.sky_shown is not None:
+            self.canvas.itemconfigure(self.sky_cache[self.sky_shown], state="hidden")
+            self.sky_shown = None
+        self.scene_keys: dict[str, tuple] = {}
+        self.scene_nodes: dict[int, list] = {}
+        self.scene_live = False
+
+    def invalidate_sky(self) -> None:
+        self.canvas.delete("sky")
+        self.sky_cache = {}
+        self.sky_shown = None
+
+    def show_sky(self) -> bool:
+        # Fondos de día y noche horneados una vez por tamaño; al cruzar SKY_SWITCH_POINTS
+        # solo se alterna cuál está visible. on_resize invalida la caché.
+        key = (self.game_width, self.game_height, self.ground_y, self.is_day_sky(), self.quality.tier)
+        if self.sky_shown == key:
+            return False
+        if self.sky_shown is not None:
+            self.canvas.itemconfigure(self.sky_cache[self.sky_shown], state="hidden")
+        tag = self.sky_cache.get(key)
+        if tag is None:
+            tag = "sky_day" if key[3] else "sky_night"
+            self.draw_dynamic_sky(tags=("sky", tag))
+            self.sky_cache[key] = tag
+        else:
+            self.canvas.itemconfigure(tag, state="normal")
+        self.sky_shown = key
+        return True
+
+    def move_scene_node(self, node: list, x: float, y: float) -> None:
+        dx = x - node[1]
+        dy = y - node[2]
+        if dx or dy:
+            self.canvas.move(node[0], dx, dy)
+            node[1] = x
+            node[2] = y
+
+    def draw_game(self, prof: FrameProfiler | None = None) -> None:
+        # Escena retenida: cada elemento conserva sus items del canvas entre frames.
+        # Solo se crean/borran al aparecer/desaparecer; el resto se mueve con canvas.move.
+        restack = False
+        t = time.perf_counter() if prof else 0.0
+
+        if self.show_sky():
+            restack = True
+        if prof:
+            t = prof.mark("sky", t)
+
+        ground_key = (self.game_width, self.game_height, self.ground_y, self.quality.tier)
+        if self.scene_keys.get("ground") != ground_key:
+            self.canvas.delete("ground")
+            self.draw_ground(tags="ground")
+            self.scene_keys["ground"] = ground_key
+            restack = True
+        # Las matas avanzan con la puntuación: grupo aparte que se rehace cuando cambian
+        # su desplazamiento o cuáles se ven, no solo con el tamaño como el suelo
+        if self.quality.settings["grass"]:
+            grass_key = (ground_key, int(self.sim.score * 0.9) % GRASS_SPACING, int(self.sim.score / 18))
+            if self.scene_keys.get("grass") != grass_key:
+                self.canvas.delete("grass")
+                self.draw_grass_decor(tags="grass")
+                self.scene_keys["grass"] = grass_key
+                restack = True
+        elif self.scene_keys.pop("grass", None) is not None:
+            self.canvas.delete("grass")
+        if prof:
+            t = prof.mark("ground", t)
+
+        # Posiciones interpoladas entre el paso de simulación anterior y el actual
+        sim = self.sim
+        alpha = self.render_alpha
+        player_x = sim.player_x
+        player_y = sim.prev_player_y + (sim.player_y - sim.prev_player_y) * alpha
+        outlined = bool(self.quality.settings["sprite_outlines"])
+        player_key = ("player", self.equipped_skin, sim.crouching, outlined)
+        drawn = self.scene_keys.get("player")
+        if drawn is None:
+            self.create_sprite(player_key, player_x, player_y, tags="player")
+            restack = True
+        else:
+            if drawn[0] != player_key:
+                self.canvas.itemconfigure("player", image=self.sprites.get(player_key))
+            if drawn[1] != player_x or drawn[2] != player_y:
+                self.canvas.move("player", player_x - drawn[1], player_y - drawn[2])
+        self.scene_keys["player"] = (player_key, player_x, player_y)
+        if prof:
+            t = prof.mark("player", t)
+
+        seen = 0
+        for entities, layer, phase in ((sim.coins, "coin", "coins"), (sim.cacti, "obstacle", "obstacles"), (sim.birds, "obstacle", "obstacles")):
+            seen += len(entities)
+            for entity in entities:
+                x1 = entity.prev_x + (entity.x - entity.prev_x) * alpha
+                y1 = entity.y
+                node = self.scene_nodes.get(entity.id)
+                if node is None:
+                    tag = f"ent{entity.id}"
+                    wing_up = None
+                    if entity.kind == KIND_COIN:
+                        self.create_sprite(("coin", entity.r, outlined), x1, y1, tags=(layer, tag))
+                    elif entity.kind == KIND_BIRD:
+                        wing_up = self.bird_wing_up(x1)
+                        self.create_sprite(("bird", wing_up, outlined), x1, y1, tags=(layer, tag))
+                    else:
+                        self.draw_cactus(x1, y1, entity.w, entity.h, tags=(layer, tag))
+                    self.scene_nodes[entity.id] = [tag, x1, y1, wing_up]
+                    restack = True
+                    continue
+                self.move_scene_node(node, x1, y1)
+                if node[3] is not None and node[3] != self.bird_wing_up(x1):
+                    node[3] = not node[3]
+                    self.canvas.itemconfigure(node[0], image=self.sprites.get(("bird", node[3], outlined)))
+            if prof:
+                t = prof.mark(phase, t)
+
+        # Despawn: borra los items de entidades que ya no existen
+        if len(self.scene_nodes) > seen:
+            alive = {entity.id for lane in sim.lanes for entity in lane}
+            for eid in [eid for eid in self.scene_nodes if eid not in alive]:
+                self.canvas.delete(self.scene_nodes.pop(eid)[0])
+
+        if restack:
+            for layer in ("sky", "ground", "grass", "player", "coin", "obstacle"):
+                self.canvas.tag_raise(layer)
+        if prof:
+            prof.mark("obstacles", t)
 
     def update_hud_branding_visibility(self) -> None:
         show = self.screen == "shop"
@@ -1250,14 +1477,38 @@ class DinoRunner:
         if not show and self.help_label.winfo_ismapped():
             self.help_label.pack_forget()
 
-    def draw(self) -> None:
-        self.update_hud_branding_visibility()
-        self.update_shop_stats_visibility()
-        self.update_login_entry_visibility()
-        self.update_help_label_visibility()
-        self.canvas.delete("all")
-        self.buttons = []
+    def invalidate(self, *_args) -> None:
+        self.menu_dirty = True
+
+    def draw(self, prof: FrameProfiler | None = None) -> None:
+        # Los menús son estáticos: solo se repintan cuando algo los invalida
+        if self.screen != self.drawn_screen:
+            self.drawn_screen = self.screen
+            self.menu_dirty = True
+        if self.menu_dirty:
+            t = time.perf_counter() if prof else 0.0
+            self.update_hud_branding_visibility()
+            self.update_shop_stats_visibility()
+            self.update_login_entry_visibility()
+            self.update_help_label_visibility()
+            self.buttons = []
+            if prof:
+                prof.mark("widgets", t)
 
+        if self.screen == "playing":
+            self.menu_dirty = False
+            if not self.scene_live:
+                self.clear_scene()
+                self.scene_live = True
+                self.quality.reset()
+            self.draw_game(prof)
+            return
+
+        if not self.menu_dirty:
+            return
+        self.menu_dirty = False
+        t = time.perf_counter() if prof else 0.0
+        self.clear_scene()
         if self.screen == "login":
             self.draw_login_screen()
         elif self.screen == "recover_password":
@@ -1270,22 +1521,81 @@ class DinoRunner:
             self.draw_shop()
         elif self.screen == "skins_menu":
             self.draw_skins_menu()
+        elif self.screen == "leaderboard":
+            self.draw_leaderboard()
         elif self.screen == "pause_menu":
             self.draw_pause_menu()
         elif self.screen == "game_over_menu":
             self.draw_game_over_menu()
-        else:
-            self.draw_game()
+        if prof:
+            prof.mark("menu", t)
+
+    def rebuild_scene(self) -> None:
+        # Tras cambiar de nivel de calidad: cielo, suelo y entidades se vuelven a crear
+        self.invalidate_sky()
+        self.scene_live = False
 
     def loop(self) -> None:
-        self.update()
-        self.draw()
-        self.root.after(FRAME_MS, self.loop)
+        # Paso fijo con acumulador de tiempo real: si Tk llega tarde se recuperan
+        # pasos (con tope) para que la velocidad del juego no dependa del render.
+        for exc in self.auth.poll():
+            self.auth_failed(self.account_status_var(), exc)
+        self.mailer.poll()
+        for username, exc in self.accounts.poll():
+            self.account_save_failed(username, exc)
+        now = time.perf_counter()
+        # El repintado real de Tk ocurre fuera de loop(): aparece como retraso del tick
+        late_ms = max(0.0, (now - self.tick_due) * 1000.0)
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            # Jitter: cuánto llega tarde Tk respecto al after() pedido
+            prof.record("jitter", (now - self.tick_due) * 1000.0)
+        self.sim_accumulator_ms += (now - self.last_tick) * 1000.0
+        self.last_tick = now
+        self.sim_accumulator_ms = min(self.sim_accumulator_ms, MAX_CATCH_UP_MS)
+        steps = 0
+        while self.sim_accumulator_ms >= self.sim_tick_ms:
+            self.update()
+            self.sim_accumulator_ms -= self.sim_tick_ms
+            steps += 1
+        self.render_alpha = self.sim_accumulator_ms / self.sim_tick_ms
+        self.render_rate.tick(now)
+        if self.screen == "playing" and self.sim.running:
+            self.sim_rate.tick(now, steps)
+        if prof:
+            prof.mark("update", now)
+        self.draw(prof)
+        if prof:
+            prof.end_frame(len(self.canvas.find_all()))
+            if prof.frames % 15 == 0:
+                rates = f"fps: {self.render_rate.rate:.0f}/{self.render_hz}  sim: {self.sim_rate.rate:.0f}/{self.sim_hz} Hz"
+                self.profiler_label.config(text="\n".join(prof.summary() + [rates, self.quality.describe()]))
+        end = time.perf_counter()
+        if self.screen == "playing" and self.sim.running and self.quality.observe((end - now) * 1000.0 + late_ms):
+            self.rebuild_scene()
+        # El siguiente frame se programa respecto al anterior previsto, no a `end`: así
+        # periodos no enteros (144 Hz = 6.94 ms) no se redondean siempre hacia el mismo lado
+        self.frame_due = max(self.frame_due + self.render_ms / 1000.0, end)
+        delay = max(1, round((self.frame_due - end) * 1000.0))
+        self.tick_due = end + delay / 1000.0
+        self.root.after(delay, self.loop)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Modern Dinosaur Game")
+    parser.add_argument("--replay", type=Path, help="reproduce una grabación (.drec) con la ventana, a velocidad real")
+    parser.add_argument("--quality", choices=["auto", "alta", "media", "baja"], help="fija el nivel de detalle (por defecto DINO_QUALITY o auto)")
+    parser.add_argument("--sim-hz", type=int, default=int(os.environ.get("DINO_SIM_HZ", SIM_HZ)), help=f"pasos de simulación por segundo (por defecto {SIM_HZ})")
+    parser.add_argument("--render-hz", type=int, default=int(os.environ.get("DINO_RENDER_HZ", SIM_HZ)), help="frames dibujados por segundo, p. ej. 120 o 144")
+    args = parser.parse_args()
+    if not (10 <= args.sim_hz <= 480 and 10 <= args.render_hz <= 480):
+        parser.error("--sim-hz y --render-hz tienen que estar entre 10 y 480")
+    replay = Recording.load(args.replay) if args.replay else None
     root = tk.Tk()
-    DinoRunner(root)
+    app = DinoRunner(root, replay, args.quality, args.sim_hz, args.render_hz)
+    if replay is not None:
+        app.screen = "playing"
+        app.reset_run(reset_record=False)
     root.mainloop()
 
 
@@ -0,0 +1,88 @@
+import csv
+import math
+import time
+from collections import deque
+from pathlib import Path
+
+PHASES = ("update", "sky", "ground", "player", "coins", "obstacles", "menu", "widgets", "jitter")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Rango más cercano sobre una lista ya ordenada
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+class FrameProfiler:
+    # Tiempos por fase del frame. Apagado no se mide nada: quien llama solo consulta
+    # `enabled` una vez por frame y se salta todas las llamadas a perf_counter.
+    def __init__(self, window: int = 240) -> None:
+        self.enabled = False
+        self.samples: dict[str, deque[float]] = {phase: deque(maxlen=window) for phase in PHASES}
+        self.current: dict[str, float] = {}
+        self.frames = 0
+        self.item_count = 0
+        self.rows: list[list[object]] | None = None
+
+    @property
+    def recording(self) -> bool:
+        return self.rows is not None
+
+    def mark(self, phase: str, start: float) -> float:
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - start) * 1000.0
+        return now
+
+    def record(self, phase: str, ms: float) -> None:
+        self.current[phase] = self.current.get(phase, 0.0) + ms
+
+    def end_frame(self, item_count: int) -> None:
+        # Solo se guardan las fases que han corrido en este frame (un menú no tiene "sky")
+        self.frames += 1
+        self.item_count = item_count
+        for phase, ms in self.current.items():
+            self.samples[phase].append(ms)
+        if self.rows is not None:
+            self.rows.append([self.frames, round(time.perf_counter(), 6), *(round(self.current[p], 4) if p in self.current else "" for p in PHASES), item_count])
+        self.current = {}
+
+    def summary(self) -> list[str]:
+        lines = [f"{'fase':<10}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for phase in PHASES:
+            values = sorted(self.samples[phase])
+            if not values:
+                continue
+            lines.append(f"{phase:<10}{percentile(values, 0.50):7.2f}{percentile(values, 0.95):7.2f}{percentile(values, 0.99):7.2f}")
+        lines.append(f"items canvas: {self.item_count}" + ("   ● REC" if self.recording else ""))
+        return lines
+
+    def start_recording(self) -> None:
+        self.rows = []
+
+    def stop_recording(self, path: Path) -> int:
+        rows = self.rows or []
+        self.rows = None
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["frame", "t", *PHASES, "items"])
+            writer.writerows(rows)
+        return len(rows)
+
+
+class RateMeter:
+    # Frecuencia conseguida de verdad (frames o pasos por segundo), por ventanas de `window_s`
+    def __init__(self, window_s: float = 1.0) -> None:
+        self.window_s = window_s
+        self.count = 0
+        self.start = time.perf_counter()
+        self.rate = 0.0
+
+    def tick(self, now: float, count: int = 1) -> None:
+        self.count += count
+        elapsed = now - self.start
+        if elapsed >= self.window_s:
+            self.rate = self.count / elapsed
+            self.count = 0
+            self.start = now
@@ -0,0 +1,90 @@
+import os
+
+# Niveles de detalle de la partida, de más a menos. Cada uno decide qué decoración se
+# dibuja: matas de hierba, estrellas, nubes y rayos del sol, cactus con brazos y borde
+# ("outline", grosor) y si los sprites horneados de jugador, pájaro y moneda llevan borde.
+TIERS = ("alta", "media", "baja")
+TIER_SETTINGS = {
+    "alta": {"grass": True, "stars": 120, "clouds": True, "sun_rays": True, "cactus_arms": True, "outline": 2, "sprite_outlines": True},
+    "media": {"grass": False, "stars": 40, "clouds": True, "sun_rays": False, "cactus_arms": True, "outline": 0, "sprite_outlines": False},
+    "baja": {"grass": False, "stars": 0, "clouds": False, "sun_rays": False, "cactus_arms": False, "outline": 0, "sprite_outlines": False},
+}
+
+# Bajar hace falta pronto (se nota en el juego); subir, solo tras mucho tiempo holgado
+DOWNGRADE_RATIO = 0.85
+UPGRADE_RATIO = 0.45
+DOWNGRADE_FRAMES = 30
+UPGRADE_FRAMES = 300
+SMOOTHING = 0.1
+
+
+class QualityGovernor:
+    # Media móvil (exponencial) del tiempo de trabajo de cada frame de partida frente al
+    # presupuesto. Con histéresis: umbrales distintos para bajar y subir, y hay que
+    # mantenerse fuera de ellos varios frames seguidos, así que no oscila entre niveles.
+    # `pinned` fija un nivel y desactiva el ajuste automático.
+    def __init__(self, budget_ms: float, pinned: str | None = None) -> None:
+        self.budget_ms = budget_ms
+        self.pinned = pinned if pinned in TIERS else None
+        self.tier = self.pinned or TIERS[0]
+        self.average_ms = 0.0
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    @classmethod
+    def from_env(cls, budget_ms: float, setting: str | None = None) -> "QualityGovernor":
+        # DINO_QUALITY=alta|media|baja fija el nivel (kioscos lentos); auto o vacío lo ajusta solo
+        value = (setting or os.environ.get("DINO_QUALITY", "auto")).lower()
+        return cls(budget_ms, value if value in TIERS else None)
+
+    @property
+    def settings(self) -> dict[str, object]:
+        return TIER_SETTINGS[self.tier]
+
+    def reset(self) -> None:
+        # Al empezar partida o volver de un menú: los frames de antes no cuentan
+        self.average_ms = 0.0
+        self.over = 0
+        self.under = 0
+
+    def observe(self, frame_ms: float) -> bool:
+        # Devuelve True si cambia el nivel (quien llama tiene que rehacer la escena)
+        if self.pinned:
+            return False
+        if self.average_ms:
+            self.average_ms += (frame_ms - self.average_ms) * SMOOTHING
+        else:
+            self.average_ms = frame_ms
+        index = TIERS.index(self.tier)
+        if self.average_ms > self.budget_ms * DOWNGRADE_RATIO and index < len(TIERS) - 1:
+            self.over += 1
+            self.under = 0
+            if self.over >= DOWNGRADE_FRAMES:
+                return self.switch(TIERS[index + 1])
+        elif self.average_ms < self.budget_ms * UPGRADE_RATIO and index > 0:
+            self.under += 1
+            self.over = 0
+            if self.under >= UPGRADE_FRAMES:
+                return self.switch(TIERS[index - 1])
+        else:
+            self.over = 0
+            self.under = 0
+        return False
+
+    def pin(self, tier: str | None) -> None:
+        self.pinned = tier if tier in TIERS else None
+        if self.pinned:
+            self.tier = self.pinned
+        self.reset()
+
+    def switch(self, tier: str) -> bool:
+        self.tier = tier
+        self.changes += 1
+        # La escena nueva cuesta un frame caro: se vuelve a medir desde cero
+        self.reset()
+        return True
+
+    def describe(self) -> str:
+        mode = "fija" if self.pinned else f"auto, media {self.average_ms:.1f} ms"
+        return f"calidad: {self.tier} ({mode})"
@@ -0,0 +1,169 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from simulation import SIM_HZ, GameSimulation
+
+MAGIC = b"DREC"
+VERSION = 4
+# Las entradas usan los bits 0-1 (INPUT_JUMP | INPUT_CROUCH); el 4 marca un cambio de tamaño
+CODE_RESIZE = 4
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    # LEB128 sin signo: 7 bits por byte, el bit alto indica que sigue otro byte
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("grabación cortada")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class RunRecorder:
+    # Solo se guardan los cambios de entrada: (pasos desde el evento anterior, entrada),
+    # normalmente 2 bytes por pulsación o suelta.
+    def __init__(self, seed: int, width: int, height: int, cactus_sizes: list[tuple[int, int]], tick_hz: int = SIM_HZ) -> None:
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.tick_hz = tick_hz
+        self.cactus_sizes = list(cactus_sizes)
+        self.events = bytearray()
+        self.last_step = 0
+        self.last_inputs = 0
+
+    def record(self, step: int, inputs: int) -> None:
+        if inputs == self.last_inputs:
+            return
+        write_varint(self.events, step - self.last_step)
+        write_varint(self.events, inputs)
+        self.last_step = step
+        self.last_inputs = inputs
+
+    def resize(self, step: int, width: int, height: int) -> None:
+        write_varint(self.events, step - self.last_step)
+        write_varint(self.events, CODE_RESIZE)
+        write_varint(self.events, width)
+        write_varint(self.events, height)
+        self.last_step = step
+
+    def to_bytes(self, steps: int, score: int) -> bytes:
+        out = bytearray(MAGIC)
+        for value in (VERSION, self.seed, self.width, self.height, self.tick_hz, len(self.cactus_sizes)):
+            write_varint(out, value)
+        for w, h in self.cactus_sizes:
+            write_varint(out, w)
+            write_varint(out, h)
+        write_varint(out, steps)
+        write_varint(out, score)
+        return bytes(out + self.events)
+
+
+class Recording:
+    def __init__(self, data: bytes) -> None:
+        if data[:4] != MAGIC:
+            raise ValueError("no es una grabación de Dino Runner")
+        version, pos = read_varint(data, 4)
+        if version != VERSION:
+            raise ValueError(f"versión de grabación no soportada: {version}")
+        values = []
+        for _ in range(5):
+            value, pos = read_varint(data, pos)
+            values.append(value)
+        self.seed, self.width, self.height, self.tick_hz, cactus_count = values
+        self.cactus_sizes: list[tuple[int, int]] = []
+        for _ in range(cactus_count):
+            w, pos = read_varint(data, pos)
+            h, pos = read_varint(data, pos)
+            self.cactus_sizes.append((w, h))
+        self.steps, pos = read_varint(data, pos)
+        self.score, pos = read_varint(data, pos)
+        # (paso absoluto, código, tamaño si es CODE_RESIZE)
+        self.events: list[tuple[int, int, tuple[int, int] | None]] = []
+        step = 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            code, pos = read_varint(data, pos)
+            step += delta
+            size = None
+            if code == CODE_RESIZE:
+                w, pos = read_varint(data, pos)
+                h, pos = read_varint(data, pos)
+                size = (w, h)
+            self.events.append((step, code, size))
+
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        return cls(path.read_bytes())
+
+    def new_simulation(self) -> GameSimulation:
+        # Los pasos grabados solo valen a la misma frecuencia de simulación
+        sim = GameSimulation(self.width, self.height, self.cactus_sizes, tick_hz=self.tick_hz)
+        sim.reset(seed=self.seed)
+        return sim
+
+
+class ReplayInput:
+    # Sustituye al teclado: antes de cada paso aplica los eventos de ese paso
+    def __init__(self, recording: Recording) -> None:
+        self.events = recording.events
+        self.index = 0
+        self.inputs = 0
+
+    def apply(self, sim: GameSimulation) -> int:
+        events = self.events
+        while self.index < len(events) and events[self.index][0] <= sim.steps:
+            _step, code, size = events[self.index]
+            if size is not None:
+                sim.resize(*size)
+            else:
+                self.inputs = code
+            self.index += 1
+        return self.inputs
+
+
+def replay_headless(recording: Recording) -> GameSimulation:
+    sim = recording.new_simulation()
+    player = ReplayInput(recording)
+    while sim.running and sim.steps < recording.steps:
+        sim.step(player.apply(sim))
+    return sim
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Comprueba grabaciones de partidas sin ventana, a máxima velocidad.")
+    parser.add_argument("paths", nargs="+", type=Path)
+    args = parser.parse_args(argv)
+    failed = 0
+    for path in args.paths:
+        try:
+            recording = Recording.load(path)
+        except (OSError, ValueError) as exc:
+            print(f"{path}: {exc}")
+            failed += 1
+            continue
+        start = time.perf_counter()
+        sim = replay_headless(recording)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        ok = sim.score == recording.score and sim.steps == recording.steps
+        failed += not ok
+        print(f"{path}: {'OK' if ok else 'NO COINCIDE'}  puntuación {sim.score} (grabada {recording.score})  pasos {sim.steps}/{recording.steps}  {len(recording.events)} eventos  {elapsed_ms:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
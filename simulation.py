@@ -0,0 +1,488 @@
+import random
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterator
+
+GRAVITY = 0.6
+JUMP_FORCE = -11
+SPAWN_MIN = 900
+SPAWN_MAX = 1700
+# Los valores por paso (GRAVITY, JUMP_FORCE, velocidades) están ajustados a pasos de
+# FRAME_MS; con otra frecuencia de simulación se reescalan a tiempo real
+FRAME_MS = 20
+SIM_HZ = 1000 // FRAME_MS
+BIRD_SCORE_THRESHOLD = 500
+COIN_SPAWN_MIN = 1200
+COIN_SPAWN_MAX = 2200
+COIN_SPAWN_CHANCE = 0.9
+COIN_VALUE = 2
+BIRD_FLIGHT_LEVELS = (90, 150, 210)
+COIN_HEIGHTS = (44, 44, 44, 70, 120)
+SPEED_START = 8.0
+SPEED_RAMP = 0.002
+# Tamaños (ancho, alto) de los cactus dibujados a mano cuando no hay imágenes
+DEFAULT_CACTUS_SIZES = ((42, 40), (28, 60))
+COURSE_CHUNK_MS = 3000
+
+PLAYER_X = 100
+PLAYER_W = 58
+STAND_H = 50
+CROUCH_H = 34
+
+# Entradas de step(): bits que el jugador (o un bot/replay) mantiene durante el paso
+INPUT_JUMP = 1
+INPUT_CROUCH = 2
+
+# Eventos devueltos por step()
+EVENT_SCORE = 1
+EVENT_COIN = 2
+EVENT_DEATH = 4
+
+KIND_CACTUS = 0
+KIND_BIRD = 1
+KIND_COIN = 2
+
+
+def jump_arc(frames_per_step: float = 1.0, gravity: float = GRAVITY, force: float = JUMP_FORCE) -> tuple[float, ...]:
+    # Altura sobre el suelo en cada paso del salto, hasta el último paso antes de
+    # aterrizar. Tras n frames de FRAME_MS el Euler de siempre (vel += g, y += vel) da
+    # -(n*force + g*n*(n+1)/2); con otra frecuencia se evalúa en n = paso * frames_per_step,
+    # así que el salto dura y sube lo mismo en tiempo real.
+    heights = [0.0]
+    step = 1
+    while True:
+        n = step * frames_per_step
+        height = -(n * force + gravity * n * (n + 1) / 2)
+        if height <= 0:
+            return tuple(heights)
+        heights.append(height)
+        step += 1
+
+
+JUMP_ARC = jump_arc()
+
+
+def slab(p: float, q: float, lo: float, hi: float, t_in: float, t_out: float) -> tuple[float, float]:
+    # Recorta [t_in, t_out] a los t en que p + q*t queda dentro de (lo, hi)
+    if not q:
+        return (t_in, t_out) if lo < p < hi else (1.0, 0.0)
+    a = (lo - p) / q
+    b = (hi - p) / q
+    if a > b:
+        a, b = b, a
+    return max(t_in, a), min(t_out, b)
+
+
+def swept_overlap(px1: float, px2: float, top0: float, top1: float, ph: float, x0: float, x1: float, w: float, oy: float, oh: float) -> bool:
+    # AABB barrido dentro de un paso: el obstáculo va de x0 a x1 y el borde superior del
+    # jugador de top0 a top1, ambos en línea recta. Hay choque si los dos intervalos de
+    # solape (en x y en y) coinciden en algún t de [0, 1].
+    t_in, t_out = slab(x0, x1 - x0, px1 - w, px2, 0.0, 1.0)
+    t_in, t_out = slab(top0, top1 - top0, oy - ph, oy + oh, t_in, t_out)
+    return t_in < t_out
+
+
+class EntityPool:
+    # Lista libre de entidades ya creadas: aparecer y desaparecer no reserva objetos nuevos
+    def __init__(self, factory: type) -> None:
+        self.factory = factory
+        self.free: list = []
+
+    def acquire(self):
+        return self.free.pop() if self.free else self.factory()
+
+    def release(self, entity) -> None:
+        self.free.append(entity)
+
+
+def anchor_of(entity) -> float:
+    return entity.anchor
+
+
+class Lane:
+    # Entidades que avanzan a la misma velocidad, ordenadas por x. Casi siempre aparecen
+    # por la derecha y basta con añadir al final; si la ventana se ha estrechado, la
+    # nueva sale a la izquierda de las que ya estaban y se inserta en su sitio. Las
+    # posiciones se guardan relativas a un desplazamiento común: mover toda la lane es
+    # sumar a `offset`, y el orden por anchor es el orden por x.
+    def __init__(self, factory: type, speed_factor: float, cull_limit: float) -> None:
+        self.pool = EntityPool(factory)
+        self.speed_factor = speed_factor
+        self.cull_limit = cull_limit
+        self.entities: deque = deque()
+        self.offset = 0.0
+        self.prev_offset = 0.0
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def spawn(self):
+        # La entidad entra en la cola al colocarla (place), cuando ya se sabe su x
+        return self.pool.acquire()
+
+    def insert(self, entity) -> None:
+        entities = self.entities
+        if not entities or entities[-1].anchor <= entity.anchor:
+            entities.append(entity)
+        else:
+            entities.insert(bisect_right(entities, entity.anchor, key=anchor_of), entity)
+
+    def remove(self, entity) -> None:
+        self.entities.remove(entity)
+        self.pool.release(entity)
+
+    def clear(self) -> None:
+        while self.entities:
+            self.pool.release(self.entities.pop())
+        self.offset = self.prev_offset = 0.0
+
+    def advance(self, speed: float) -> None:
+        self.prev_offset = self.offset
+        self.offset += speed * self.speed_factor
+
+    def cull(self) -> None:
+        # Las que salen por la izquierda están siempre al principio de la cola
+        entities = self.entities
+        while entities and entities[0].anchor - self.offset + entities[0].w <= self.cull_limit:
+            self.pool.release(entities.popleft())
+
+
+class Obstacle:
+    __slots__ = ("id", "lane", "anchor", "y", "w", "h", "sprite")
+    kind = KIND_CACTUS
+
+    def place(self, entity_id: int, lane: Lane, x: float, y: float, w: float, h: float, sprite: int) -> "Obstacle":
+        self.id = entity_id
+        self.lane = lane
+        self.anchor = x + lane.offset
+        self.y = float(y)
+        self.w = float(w)
+        self.h = float(h)
+        self.sprite = sprite
+        lane.insert(self)
+        return self
+
+    @property
+    def x(self) -> float:
+        return self.anchor - self.lane.offset
+
+    @property
+    def prev_x(self) -> float:
+        return self.anchor - self.lane.prev_offset
+
+
+class Bird(Obstacle):
+    __slots__ = ()
+    kind = KIND_BIRD
+
+
+class Coin(Obstacle):
+    __slots__ = ("r",)
+    kind = KIND_COIN
+
+    def place_coin(self, entity_id: int, lane: Lane, x: float, y: float, r: float) -> "Coin":
+        self.r = float(r)
+        self.place(entity_id, lane, x, y, 2 * r, 2 * r, -1)
+        return self
+
+
+class CourseEntry:
+    __slots__ = ("step", "kind", "level", "sprite")
+
+    def __init__(self, step: int, kind: int, level: int, sprite: int) -> None:
+        # level: altura sobre el suelo (vuelo del pájaro o de la moneda), 0 en los cactus
+        self.step = step
+        self.kind = kind
+        self.level = level
+        self.sprite = sprite
+
+
+def ms_to_steps(ms: int, tick_hz: int) -> int:
+    # Primer paso en que han pasado `ms` milisegundos (aritmética entera, sin deriva)
+    return -(-ms * tick_hz // 1000)
+
+
+def course_chunks(seed: int, cactus_count: int, start_score: int = 0, spawn_min: int = SPAWN_MIN, spawn_max: int = SPAWN_MAX, bird_score_threshold: int = BIRD_SCORE_THRESHOLD, coin_spawn_min: int = COIN_SPAWN_MIN, coin_spawn_max: int = COIN_SPAWN_MAX, coin_spawn_chance: float = COIN_SPAWN_CHANCE, tick_hz: int = SIM_HZ) -> Iterator[list[CourseEntry]]:
+    # Recorrido infinito en tramos de COURSE_CHUNK_MS, ordenados por paso de aparición.
+    # Obstáculos y monedas tiran de generadores aleatorios separados derivados de la
+    # semilla, así que cambiar la probabilidad de moneda no mueve ningún cactus.
+    obstacle_rng = random.Random(seed << 1)
+    coin_rng = random.Random(seed << 1 | 1)
+    chunk_steps = ms_to_steps(COURSE_CHUNK_MS, tick_hz)
+    # Igual que los temporizadores de antes: se aparece en el primer paso en que el tiempo restante llega a 0
+    next_obstacle = ms_to_steps(obstacle_rng.randint(spawn_min, spawn_max), tick_hz)
+    next_coin = ms_to_steps(coin_rng.randint(coin_spawn_min, coin_spawn_max), tick_hz)
+    end = 0
+    while True:
+        end += chunk_steps
+        chunk = []
+        while next_obstacle < end:
+            score = start_score + 10 * (next_obstacle // tick_hz)
+            if score >= bird_score_threshold and obstacle_rng.random() < 0.4:
+                chunk.append(CourseEntry(next_obstacle, KIND_BIRD, obstacle_rng.choice(BIRD_FLIGHT_LEVELS), -1))
+            else:
+                chunk.append(CourseEntry(next_obstacle, KIND_CACTUS, 0, obstacle_rng.randrange(cactus_count)))
+            next_obstacle += ms_to_steps(obstacle_rng.randint(spawn_min, spawn_max), tick_hz)
+        while next_coin < end:
+            if coin_rng.random() < coin_spawn_chance:
+                chunk.append(CourseEntry(next_coin, KIND_COIN, coin_rng.choice(COIN_HEIGHTS), -1))
+            next_coin += ms_to_steps(coin_rng.randint(coin_spawn_min, coin_spawn_max), tick_hz)
+        # Estable: en el mismo paso el obstáculo va antes que la moneda
+        chunk.sort(key=lambda entry: entry.step)
+        yield chunk
+
+
+class Course:
+    # Lo que va a aparecer, generado a tramos solo cuando hace falta. step() saca lo que
+    # toca en cada paso; bots y comprobaciones pueden mirar por delante con upcoming().
+    def __init__(self, chunks: Iterator[list[CourseEntry]], tick_hz: int = SIM_HZ) -> None:
+        self.chunks = chunks
+        self.chunk_steps = ms_to_steps(COURSE_CHUNK_MS, tick_hz)
+        self.pending: deque[CourseEntry] = deque()
+        self.horizon = 0
+
+    def extend(self) -> None:
+        self.pending.extend(next(self.chunks))
+        self.horizon += self.chunk_steps
+
+    def pop_due(self, step: int) -> CourseEntry | None:
+        while self.horizon <= step:
+            self.extend()
+        pending = self.pending
+        if pending and pending[0].step <= step:
+            return pending.popleft()
+        return None
+
+    def upcoming(self, until_step: int) -> list[CourseEntry]:
+        while self.horizon <= until_step:
+            self.extend()
+        return [entry for entry in self.pending if entry.step <= until_step]
+
+
+class GameSimulation:
+    # Núcleo del juego sin Tk: física, aparición, puntuación y colisiones.
+    def __init__(self, width: int, height: int, cactus_sizes: list[tuple[int, int]] | None = None, rng: random.Random | None = None, tick_hz: int = SIM_HZ) -> None:
+        self.rng = rng if rng is not None else random.Random()
+        # Pasos por segundo. speed y speed_ramp siguen en px por frame de FRAME_MS;
+        # tick_scale los pasa a px por paso (los factores de cada lane son relativos a speed)
+        self.tick_hz = tick_hz
+        self.tick_scale = SIM_HZ / tick_hz
+        self.jump_arc = JUMP_ARC if tick_hz == SIM_HZ else jump_arc(self.tick_scale)
+        self.cactus_sizes = list(cactus_sizes or [])
+        # Parámetros de dificultad por instancia (difficulty.py los cambia para barridos)
+        self.spawn_min = SPAWN_MIN
+        self.spawn_max = SPAWN_MAX
+        self.bird_score_threshold = BIRD_SCORE_THRESHOLD
+        self.coin_spawn_min = COIN_SPAWN_MIN
+        self.coin_spawn_max = COIN_SPAWN_MAX
+        self.coin_spawn_chance = COIN_SPAWN_CHANCE
+        self.speed_ramp = SPEED_RAMP
+        self.width = width
+        self.height = height
+        self.ground_y = height - 170
+        self.next_entity_id = 0
+        self.score = 0
+        # Cactus, pájaros y monedas van a velocidades distintas: una lane para cada uno
+        self.cacti = Lane(Obstacle, 1.0, -50)
+        self.birds = Lane(Bird, 1.25, -50)
+        self.coins = Lane(Coin, 1.05, -40)
+        self.lanes = (self.cacti, self.birds, self.coins)
+        self.reset()
+
+    def reset(self, keep_score: bool = False, seed: int | None = None) -> None:
+        # Con semilla la partida es reproducible: todo el azar sale de self.rng
+        if seed is not None:
+            self.rng = random.Random(seed)
+        self.seed = seed
+        self.player_x = PLAYER_X
+        self.player_w = PLAYER_W
+        self.player_h = STAND_H
+        self.player_y = self.ground_y - self.player_h
+        self.prev_player_y = self.player_y
+        self.air_step = 0
+        self.grounded = True
+        self.crouching = False
+
+        self.speed = SPEED_START
+        if not keep_score:
+            self.score = 0
+        self.score_ticks = 0
+        # Sin semilla (seguir tras perder) el recorrido nuevo sale del rng de la partida
+        course_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.course = Course(course_chunks(course_seed, len(self.cactus_sizes) or len(DEFAULT_CACTUS_SIZES), self.score, self.spawn_min, self.spawn_max, self.bird_score_threshold, self.coin_spawn_min, self.coin_spawn_max, self.coin_spawn_chance, self.tick_hz), self.tick_hz)
+        for lane in self.lanes:
+            lane.clear()
+        self.step_coins = 0
+        self.steps = 0
+        self.killed_by: Obstacle | None = None
+        self.running = True
+
+    def resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.ground_y = height - 170
+        self.player_y = self.ground_y - self.player_h - (0.0 if self.grounded else self.jump_arc[self.air_step])
+        self.prev_player_y = self.player_y
+        for obs in self.cacti:
+            obs.y = self.ground_y - obs.h
+
+    def new_entity_id(self) -> int:
+        self.next_entity_id += 1
+        return self.next_entity_id
+
+    def set_crouch(self, crouching: bool) -> None:
+        if crouching == self.crouching:
+            return
+        self.crouching = crouching
+        self.player_h = CROUCH_H if crouching else STAND_H
+        self.player_y = self.ground_y - self.player_h
+        self.prev_player_y = self.player_y
+        # Cambiar de postura en el aire baja al suelo y termina el salto
+        self.grounded = True
+        self.air_step = 0
+
+    def spawn(self, entry: CourseEntry) -> None:
+        if entry.kind == KIND_BIRD:
+            self.birds.spawn().place(self.new_entity_id(), self.birds, self.width + 30, self.ground_y - entry.level, 80, 44, -1)
+        elif entry.kind == KIND_COIN:
+            r = 22.0
+            self.coins.spawn().place_coin(self.new_entity_id(), self.coins, self.width + 30, self.ground_y - entry.level, r)
+        elif self.cactus_sizes:
+            w, h = self.cactus_sizes[entry.sprite]
+            self.cacti.spawn().place(self.new_entity_id(), self.cacti, self.width + 20, self.ground_y - h, w, h, entry.sprite)
+        else:
+            w, h = DEFAULT_CACTUS_SIZES[entry.sprite]
+            self.cacti.spawn().place(self.new_entity_id(), self.cacti, self.width + 20, self.ground_y - h, w, h, -1)
+
+    def collide(self, obs: Obstacle) -> bool:
+        # Mismo test barrido que step(), con las posiciones de este paso
+        px1 = self.player_x + 6
+        px2 = px1 + self.player_w - 12
+        return swept_overlap(px1, px2, self.prev_player_y + 4, self.player_y + 4, self.player_h - 6, obs.prev_x, obs.x, obs.w, obs.y, obs.h)
+
+    def collect_coin(self, coin: Coin) -> bool:
+        # La moneda recorre un segmento horizontal en el paso; el jugador se toma como la
+        # caja que cubre todo su recorrido vertical (un poco generoso, nunca se la salta)
+        px1 = self.player_x + 6
+        px2 = px1 + self.player_w - 12
+        top0 = self.prev_player_y + 4
+        top1 = self.player_y + 4
+        py1 = min(top0, top1)
+        py2 = max(top0, top1) + self.player_h - 6
+
+        r = coin.r
+        dx = max(0.0, px1 - (coin.prev_x + r), coin.x + r - px2)
+        cy = coin.y + r
+        dy = cy - min(max(cy, py1), py2)
+        return dx * dx + dy * dy <= r * r
+
+    def step(self, inputs: int = 0) -> int:
+        if not self.running:
+            return 0
+        events = 0
+        self.steps += 1
+        self.step_coins = 0
+
+        if inputs & INPUT_CROUCH:
+            self.set_crouch(True)
+        elif self.crouching:
+            self.set_crouch(False)
+        if inputs & INPUT_JUMP and self.grounded:
+            self.grounded = False
+            self.air_step = 0
+
+        self.prev_player_y = self.player_y
+        if not self.grounded:
+            # La trayectoria del salto sale de la tabla precalculada
+            self.air_step += 1
+            if self.air_step < len(self.jump_arc):
+                self.player_y = self.ground_y - self.player_h - self.jump_arc[self.air_step]
+            else:
+                self.player_y = self.ground_y - self.player_h
+                self.air_step = 0
+                self.grounded = True
+
+        # 10 puntos por segundo: un segundo son tick_hz pasos
+        self.score_ticks += 1
+        if self.score_ticks >= self.tick_hz:
+            self.score += 10
+            self.score_ticks -= self.tick_hz
+            events |= EVENT_SCORE
+
+        entry = self.course.pop_due(self.steps)
+        while entry is not None:
+            self.spawn(entry)
+            entry = self.course.pop_due(self.steps)
+
+        self.speed += self.speed_ramp * self.tick_scale
+        speed = self.speed * self.tick_scale
+        # Caja del jugador calculada una vez por paso (mismo test que collide/collect_coin).
+        # py1/py2 cubren todo lo que ha barrido en vertical desde el paso anterior.
+        px1 = self.player_x + 6
+        px2 = px1 + self.player_w - 12
+        ph = self.player_h - 6
+        top0 = self.prev_player_y + 4
+        top1 = self.player_y + 4
+        py1 = min(top0, top1)
+        py2 = max(top0, top1) + ph
+        for lane in self.lanes:
+            lane.advance(speed)
+
+        # Fase amplia: cada lane está ordenada por x, así que solo se prueban las
+        # entidades cuyo recorrido en este paso toca el rango x del jugador, y se corta
+        # cuando una termina el paso todavía a la derecha de px2. Con la velocidad
+        # subiendo sin tope, un cactus estrecho puede cruzar al jugador entero en un
+        # paso: el test es barrido, no de posición final.
+        for lane in (self.cacti, self.birds):
+            offset = lane.offset
+            prev_offset = lane.prev_offset
+            for obs in lane.entities:
+                anchor = obs.anchor
+                x = anchor - offset
+                if x >= px2:
+                    break
+                w = obs.w
+                x0 = anchor - prev_offset
+                if x0 + w <= px1:
+                    continue
+                oy = obs.y
+                oh = obs.h
+                if oy >= py2 or oy + oh <= py1:
+                    continue
+                # Solape al final del paso (el caso normal) antes de calcular tiempos
+                if (x + w > px1 and top1 < oy + oh and top1 + ph > oy) or swept_overlap(px1, px2, top0, top1, ph, x0, x, w, oy, oh):
+                    self.running = False
+                    events |= EVENT_DEATH
+                    if self.killed_by is None:
+                        self.killed_by = obs
+
+        collected: list[Coin] | None = None
+        offset = self.coins.offset
+        prev_offset = self.coins.prev_offset
+        for coin in self.coins.entities:
+            x = coin.anchor - offset
+            if x > px2:
+                break
+            x0 = coin.anchor - prev_offset
+            if x0 + coin.w < px1:
+                continue
+            r = coin.r
+            dx = max(0.0, px1 - (x0 + r), x + r - px2)
+            cy = coin.y + r
+            dy = cy - min(max(cy, py1), py2)
+            if dx * dx + dy * dy <= r * r:
+                if collected is None:
+                    collected = []
+                collected.append(coin)
+        if collected:
+            for coin in collected:
+                self.coins.remove(coin)
+            self.step_coins = len(collected)
+            events |= EVENT_COIN
+
+        for lane in self.lanes:
+            lane.cull()
+        return events
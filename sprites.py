@@ -0,0 +1,159 @@
+import math
+import tkinter as tk
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from tkinter import font as tkfont
+
+# Glifos 3x5 para los pocos textos que llevan los sprites ("7", "10", "E")
+GLYPHS = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "E": ("111", "100", "110", "100", "111"),
+}
+
+
+def flatten_coords(coords: tuple) -> list[float]:
+    flat: list[float] = []
+    for value in coords:
+        if isinstance(value, (list, tuple)):
+            flat.extend(float(v) for v in value)
+        else:
+            flat.append(float(value))
+    return flat
+
+
+class SpriteCanvas:
+    # Rasterizador mínimo con la misma API create_* que tk.Canvas, para hornear
+    # en un PhotoImage los dibujos vectoriales sin duplicar el código de dibujo.
+    # Con outlines=False se ignoran los bordes de las figuras (calidad media y baja).
+    def __init__(self, width: int, height: int, outlines: bool = True) -> None:
+        self.width = width
+        self.height = height
+        self.outlines = outlines
+        self.pixels: list[list[str | None]] = [[None] * width for _ in range(height)]
+
+    def fill_where(self, x1: float, y1: float, x2: float, y2: float, color: str, inside: Callable[[float, float], bool]) -> None:
+        if not color:
+            return
+        for py in range(max(0, math.floor(y1)), min(self.height, math.ceil(y2))):
+            row = self.pixels[py]
+            cy = py + 0.5
+            for px in range(max(0, math.floor(x1)), min(self.width, math.ceil(x2))):
+                if inside(px + 0.5, cy):
+                    row[px] = color
+
+    def create_rectangle(self, *coords, fill: str = "", outline: str = "black", width: float = 1, **_kw) -> int:
+        x1, y1, x2, y2 = flatten_coords(coords)
+        outline = outline if self.outlines else ""
+        half = width / 2 if outline else 0
+        if outline:
+            self.fill_where(x1 - half, y1 - half, x2 + half, y2 + half, outline, lambda _x, _y: True)
+        self.fill_where(x1 + half, y1 + half, x2 - half, y2 - half, fill, lambda _x, _y: True)
+        return 0
+
+    def create_oval(self, *coords, fill: str = "", outline: str = "black", width: float = 1, **_kw) -> int:
+        x1, y1, x2, y2 = flatten_coords(coords)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        outline = outline if self.outlines else ""
+        half = width / 2 if outline else 0
+
+        def ellipse(rx: float, ry: float) -> Callable[[float, float], bool]:
+            if rx <= 0 or ry <= 0:
+                return lambda _x, _y: False
+            return lambda x, y: ((x - cx) / rx) ** 2 + ((y - cy) / ry) ** 2 <= 1.0
+
+        rx, ry = (x2 - x1) / 2, (y2 - y1) / 2
+        if outline:
+            self.fill_where(x1 - half, y1 - half, x2 + half, y2 + half, outline, ellipse(rx + half, ry + half))
+        self.fill_where(x1, y1, x2, y2, fill, ellipse(rx - half, ry - half))
+        return 0
+
+    def create_polygon(self, *coords, fill: str = "black", outline: str = "", width: float = 1, **_kw) -> int:
+        flat = flatten_coords(coords)
+        points = list(zip(flat[0::2], flat[1::2]))
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+
+        def inside(x: float, y: float) -> bool:
+            # Regla par-impar sobre el centro del píxel
+            result = False
+            j = len(points) - 1
+            for i, (xi, yi) in enumerate(points):
+                xj, yj = points[j]
+                if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                    result = not result
+                j = i
+            return result
+
+        self.fill_where(min(xs), min(ys), max(xs), max(ys), fill, inside)
+        if outline and self.outlines:
+            for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+                self.create_line(ax, ay, bx, by, fill=outline, width=width)
+        return 0
+
+    def create_line(self, *coords, fill: str = "black", width: float = 1, **_kw) -> int:
+        flat = flatten_coords(coords)
+        reach = max(0.5, width / 2)
+        for (ax, ay), (bx, by) in zip(zip(flat[0::2], flat[1::2]), zip(flat[2::2], flat[3::2])):
+            dx, dy = bx - ax, by - ay
+            length_sq = dx * dx + dy * dy or 1.0
+
+            def near(x: float, y: float, ax: float = ax, ay: float = ay, dx: float = dx, dy: float = dy, length_sq: float = length_sq) -> bool:
+                t = min(1.0, max(0.0, ((x - ax) * dx + (y - ay) * dy) / length_sq))
+                ex = x - (ax + t * dx)
+                ey = y - (ay + t * dy)
+                return ex * ex + ey * ey <= reach * reach
+
+            self.fill_where(min(ax, bx) - reach, min(ay, by) - reach, max(ax, bx) + reach, max(ay, by) + reach, fill, near)
+        return 0
+
+    def create_text(self, x: float, y: float, text: str = "", fill: str = "black", font: tuple | tkfont.Font = ("", 10), **_kw) -> int:
+        size = font.cget("size") if isinstance(font, tkfont.Font) else font[1]
+        scale = max(1, round(abs(int(size)) / 6))
+        glyphs = [GLYPHS[ch] for ch in str(text) if ch in GLYPHS]
+        if not glyphs:
+            return 0
+        total_w = (len(glyphs) * 4 - 1) * scale
+        left = round(x - total_w / 2)
+        top = round(y - 5 * scale / 2)
+        for index, glyph in enumerate(glyphs):
+            gx = left + index * 4 * scale
+            for row, bits in enumerate(glyph):
+                for col, bit in enumerate(bits):
+                    if bit == "1":
+                        self.create_rectangle(gx + col * scale, top + row * scale, gx + (col + 1) * scale, top + (row + 1) * scale, fill=fill, outline="")
+        return 0
+
+    def to_photo(self, master: tk.Misc) -> tk.PhotoImage:
+        image = tk.PhotoImage(master=master, width=self.width, height=self.height)
+        # Solo se suben los tramos opacos; el resto del PhotoImage queda transparente
+        for py, row in enumerate(self.pixels):
+            px = 0
+            while px < self.width:
+                if row[px] is None:
+                    px += 1
+                    continue
+                start = px
+                while px < self.width and row[px] is not None:
+                    px += 1
+                image.put("{" + " ".join(row[start:px]) + "}", to=(start, py))
+        return image
+
+
+class SpriteCache:
+    def __init__(self, bake: Callable[[Hashable], tk.PhotoImage], capacity: int = 64) -> None:
+        self.bake = bake
+        self.capacity = capacity
+        self.images: OrderedDict[Hashable, tk.PhotoImage] = OrderedDict()
+
+    def get(self, key: Hashable) -> tk.PhotoImage:
+        image = self.images.get(key)
+        if image is None:
+            image = self.bake(key)
+            self.images[key] = image
+            if len(self.images) > self.capacity:
+                self.images.popitem(last=False)
+        else:
+            self.images.move_to_end(key)
+        return image
@@ -0,0 +1,713 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Hashable
+from pathlib import Path
+
+SAVE_DEBOUNCE_S = 0.5
+JOURNAL_COMPACT_LINES = 500
+JOURNAL_SEQ_KEY = "_journal_seq"
+PROGRESS_FIELDS = {"emilianos", "best_score", "equipped_skin", "owned_skins"}
+
+
+def atomic_write_text(path: Path, text: str, durable: bool = True) -> None:
+    # Temporal en el mismo directorio + fsync + os.replace: si el proceso muere a mitad,
+    # en disco queda el fichero anterior completo o el nuevo completo, nunca uno cortado.
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            if durable:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if not durable:
+        return
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def load_accounts_file(path: Path) -> dict[str, dict[str, object]]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_suffix(".journal")
+
+
+def progress_events(old: object, new: dict[str, object]) -> list[list]:
+    # Traduce el cambio de un registro a eventos cortos ("coin", "buy", "equip", "best").
+    # Lo que no es progreso (contraseña, correo, cuenta nueva) va como "set" del registro entero.
+    if not isinstance(old, dict) or any(old.get(key) != new.get(key) for key in old.keys() | new.keys() if key not in PROGRESS_FIELDS):
+        return [["set", new]]
+    old_owned = list(old.get("owned_skins", []))
+    new_owned = list(new.get("owned_skins", []))
+    if any(skin not in new_owned for skin in old_owned):
+        return [["set", new]]
+    events: list[list] = []
+    delta = int(new.get("emilianos", 0)) - int(old.get("emilianos", 0))
+    if delta:
+        events.append(["coin", delta])
+    events.extend(["buy", skin] for skin in new_owned if skin not in old_owned)
+    if new.get("equipped_skin") != old.get("equipped_skin"):
+        events.append(["equip", new.get("equipped_skin")])
+    if new.get("best_score") != old.get("best_score"):
+        events.append(["best", new.get("best_score")])
+    return events
+
+
+def apply_event(records: dict[str, dict[str, object]], username: str, op: str, arg: object) -> None:
+    if op == "set":
+        records[username] = dict(arg)
+        return
+    info = records.get(username)
+    if not isinstance(info, dict):
+        info = records[username] = {}
+    if op == "coin":
+        info["emilianos"] = int(info.get("emilianos", 0)) + int(arg)
+    elif op == "buy":
+        owned = list(info.get("owned_skins", ["default"]))
+        if arg not in owned:
+            owned.append(arg)
+        info["owned_skins"] = owned
+    elif op == "equip":
+        info["equipped_skin"] = arg
+    elif op == "best":
+        info["best_score"] = arg
+
+
+def load_journaled_accounts(path: Path) -> tuple[dict[str, dict[str, object]], int, int, int]:
+    # Último snapshot + los eventos del diario posteriores a él. Devuelve también la
+    # secuencia alcanzada, cuántas líneas válidas hay y hasta qué byte son válidas
+    # (una línea cortada por un cierre brusco se descarta junto con lo que venga detrás).
+    records = load_accounts_file(path)
+    seq = records.pop(JOURNAL_SEQ_KEY, 0)
+    seq = seq if isinstance(seq, int) else 0
+    lines = 0
+    good_bytes = 0
+    try:
+        raw = journal_path(path).read_bytes()
+    except OSError:
+        return records, seq, lines, good_bytes
+    for line in raw.splitlines(keepends=True):
+        try:
+            line_seq, username, op, arg = json.loads(line)
+        except (ValueError, TypeError):
+            break
+        if not line.endswith(b"\n"):
+            break
+        good_bytes += len(line)
+        lines += 1
+        if line_seq > seq:
+            apply_event(records, username, op, arg)
+            seq = line_seq
+    return records, seq, lines, good_bytes
+
+
+class BatchWriter:
+    # Hilo de escritura en segundo plano. El hilo de Tk solo deja una copia de lo que ha
+    # cambiado y avisa; el hilo junta los cambios que lleguen durante `debounce_s` (la
+    # última versión de cada clave gana) y llama a write_batch una vez por lote, así que
+    # el frame nunca espera al disco.
+    name = "writer"
+
+    def __init__(self, debounce_s: float = SAVE_DEBOUNCE_S) -> None:
+        self.debounce_s = debounce_s
+        self.pending: dict = {}
+        self.dirty_since = 0.0
+        self.flush_requested = False
+        self.closing = False
+        self.writes = 0
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def put(self, key: Hashable, record: dict[str, object]) -> None:
+        record = dict(record)
+        with self.cond:
+            if not self.pending:
+                self.dirty_since = time.monotonic()
+            self.pending[key] = record
+            self.cond.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # Pide escribir ya lo pendiente y espera a que esté en disco
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            self.flush_requested = True
+            self.cond.notify_all()
+            while self.pending or self.flush_requested:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self.flush(timeout)
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+    def write_batch(self, batch: dict) -> None:
+        raise NotImplementedError
+
+    def run(self) -> None:
+        while True:
+            with self.cond:
+                while not self.closing and not self.flush_requested:
+                    if self.pending:
+                        wait = self.dirty_since + self.debounce_s - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self.cond.wait(wait)
+                    else:
+                        self.cond.wait()
+                if self.closing and not self.pending:
+                    return
+                batch = self.pending
+                self.pending = {}
+            try:
+                self.write_batch(batch)
+            except OSError as exc:
+                print(f"No se pudieron guardar las cuentas: {exc}")
+            with self.cond:
+                if not self.pending:
+                    self.flush_requested = False
+                self.cond.notify_all()
+
+
+class AccountWriter(BatchWriter):
+    # Escritor del JSON único: cada lote se añade al diario como eventos de una línea.
+    # Cuando el diario pasa de `compact_lines` se vuelca todo a un snapshot nuevo
+    # (escritura atómica) y el diario vuelve a empezar.
+    name = "account-writer"
+
+    def __init__(self, path: Path, accounts: dict[str, dict[str, object]], seq: int = 0, journal_lines: int = 0, debounce_s: float = SAVE_DEBOUNCE_S, compact_lines: int = JOURNAL_COMPACT_LINES) -> None:
+        self.path = path
+        self.journal = journal_path(path)
+        self.compact_lines = compact_lines
+        # Copia propia de los registros: el hilo nunca recorre el dict que modifica Tk
+        self.records = {user: dict(info) for user, info in accounts.items() if isinstance(info, dict)}
+        self.seq = seq
+        self.journal_lines = journal_lines
+        self.compactions = 0
+        super().__init__(debounce_s)
+
+    def write_batch(self, batch: dict[str, dict[str, object]]) -> None:
+        if batch:
+            self.append_events(batch)
+        if self.journal_lines >= self.compact_lines:
+            self.compact()
+
+    def append_events(self, batch: dict[str, dict[str, object]]) -> None:
+        lines = []
+        seq = self.seq
+        for username, record in batch.items():
+            for op, arg in progress_events(self.records.get(username), record):
+                seq += 1
+                lines.append(json.dumps([seq, username, op, arg], ensure_ascii=False, separators=(",", ":")) + "\n")
+        if lines:
+            with self.journal.open("a", encoding="utf-8") as handle:
+                handle.write("".join(lines))
+                handle.flush()
+                os.fsync(handle.fileno())
+            self.journal_lines += len(lines)
+            self.writes += 1
+        # Solo tras escribir: si el disco falla, el siguiente lote vuelve a diferenciar contra lo guardado
+        self.seq = seq
+        self.records.update(batch)
+
+    def compact(self) -> None:
+        # El snapshot guarda la secuencia que ya incluye: si el proceso muere antes de
+        # vaciar el diario, al arrancar se saltan esas líneas en vez de aplicarlas dos veces.
+        snapshot: dict[str, object] = dict(self.records)
+        snapshot[JOURNAL_SEQ_KEY] = self.seq
+        atomic_write_text(self.path, json.dumps(snapshot, ensure_ascii=False, indent=2))
+        with self.journal.open("w", encoding="utf-8") as handle:
+            os.fsync(handle.fileno())
+        self.journal_lines = 0
+        self.compactions += 1
+
+
+class JsonAccountStore:
+    # Cuentas en un snapshot JSON más un diario de eventos. Todo vive en memoria; el disco lo lleva AccountWriter.
+    kind = "json"
+
+    def __init__(self, path: Path) -> None:
+        self.records, seq, journal_lines, good_bytes = load_journaled_accounts(path)
+        journal = journal_path(path)
+        if journal.exists() and journal.stat().st_size > good_bytes:
+            # Cola cortada por un cierre brusco: se quita para que lo siguiente empiece en línea nueva
+            with journal.open("r+b") as handle:
+                handle.truncate(good_bytes)
+        self.writer = AccountWriter(path, self.records, seq, journal_lines)
+        # Índice correo -> usuario; con correos repetidos gana el primero, como el recorrido lineal de antes
+        self.by_email: dict[str, str] = {}
+        for username, info in self.records.items():
+            if isinstance(info, dict):
+                self.by_email.setdefault(normalize_email(info.get("email", "")), username)
+        self.by_email.pop("", None)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self.records
+
+    def __getitem__(self, username: str) -> dict[str, object]:
+        return self.records[username]
+
+    def get(self, username: str, default: dict[str, object] | None = None) -> dict[str, object] | None:
+        return self.records.get(username, default)
+
+    def __setitem__(self, username: str, info: dict[str, object]) -> None:
+        old = self.records.get(username)
+        if isinstance(old, dict):
+            old_email = normalize_email(old.get("email", ""))
+            if self.by_email.get(old_email) == username:
+                del self.by_email[old_email]
+                # Si otra cuenta comparte ese correo pasa a ser la dueña (caso raro: recorrido lineal)
+                owner = next((user for user, other in self.records.items() if user != username and isinstance(other, dict) and normalize_email(other.get("email", "")) == old_email), "")
+                if owner:
+                    self.by_email[old_email] = owner
+        self.records[username] = info
+        email = normalize_email(info.get("email", ""))
+        if email:
+            self.by_email.setdefault(email, username)
+        self.writer.put(username, info)
+
+    def find_by_email(self, email: str) -> str:
+        return self.by_email.get(normalize_email(email), "")
+
+    def scores(self) -> list[tuple[str, int]]:
+        return [(user, int(info.get("best_score", 0))) for user, info in self.records.items() if isinstance(info, dict)]
+
+    def poll(self) -> list[tuple[str, Exception]]:
+        # Sin restricciones entre cuentas en disco: no hay escrituras que se rechacen
+        return []
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+UPSERT_ACCOUNT = """
+    INSERT INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(username) DO UPDATE SET
+        password = excluded.password,
+        email = excluded.email,
+        emilianos = excluded.emilianos,
+        best_score = excluded.best_score,
+        equipped_skin = excluded.equipped_skin,
+        owned_skins = excluded.owned_skins
+"""
+
+
+ACCOUNT_COLUMNS = "password, email, emilianos, best_score, equipped_skin, owned_skins"
+
+
+def open_sqlite(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # En WAL, NORMAL no hace fsync en cada commit (solo en los checkpoints)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SqliteWriter(BatchWriter):
+    # Escritor de SQLite con su propia conexión: los UPSERT, los commits y los checkpoints
+    # del WAL (que sí hacen fsync) van en este hilo, nunca en el de Tk. Un lote es una
+    # transacción. Cada fila escrita (o rechazada) vuelve por `results` al hilo de Tk.
+    name = "sqlite-writer"
+
+    def __init__(self, path: Path, debounce_s: float = SAVE_DEBOUNCE_S) -> None:
+        # Se crea aquí pero solo la usa el hilo de escritura (y close(), después del join)
+        self.conn = open_sqlite(path, check_same_thread=False)
+        self.results: queue.SimpleQueue[tuple[str, dict[str, object], Exception | None]] = queue.SimpleQueue()
+        super().__init__(debounce_s)
+
+    def write_batch(self, batch: dict[str, dict[str, object]]) -> None:
+        done: list[tuple[str, dict[str, object], Exception | None]] = []
+        try:
+            with self.conn:
+                for username, info in batch.items():
+                    try:
+                        self.conn.execute(UPSERT_ACCOUNT, account_row(username, info))
+                        done.append((username, info, None))
+                    except sqlite3.IntegrityError as exc:
+                        # Correo repetido: se rechaza solo esa cuenta, no el lote entero
+                        done.append((username, info, exc))
+        except sqlite3.Error as exc:
+            # Sin commit no se guardó nada del lote
+            done = [(username, info, exc) for username, info in batch.items()]
+        for result in done:
+            self.results.put(result)
+        self.writes += 1
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        super().close(timeout)
+        if not self.thread.is_alive():
+            self.conn.close()
+
+
+class SqliteAccountStore:
+    # Una fila por cuenta, correo con índice único sin distinguir mayúsculas y UPSERT por
+    # fila: guardar las monedas de un jugador ya no reescribe a todos los demás. Al abrir
+    # no se carga nada: get() y find_by_email() preguntan a SQLite por la clave o por el
+    # índice del correo y guardan la fila en `records`. Las escrituras las lleva
+    # SqliteWriter; hasta que confirma, la cuenta queda en `unsaved` y se lee de memoria.
+    kind = "sqlite"
+
+    def __init__(self, path: Path, legacy_json: Path | None = None) -> None:
+        self.conn = open_sqlite(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS accounts (
+                username TEXT PRIMARY KEY,
+                password TEXT NOT NULL DEFAULT '',
+                email TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+                emilianos INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER NOT NULL DEFAULT 0,
+                equipped_skin TEXT NOT NULL DEFAULT 'default',
+                owned_skins TEXT NOT NULL DEFAULT '["default"]'
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS accounts_email ON accounts(email) WHERE email <> '';
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        if legacy_json is not None:
+            self.migrate_json(self.conn, legacy_json)
+        # None = se sabe que la cuenta no existe
+        self.records: dict[str, dict[str, object] | None] = {}
+        self.unsaved: set[str] = set()
+        self.writer = SqliteWriter(path)
+
+    def migrate_json(self, conn: sqlite3.Connection, legacy_json: Path) -> None:
+        # Migración única: el JSON se deja intacto como copia de seguridad
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone() or not legacy_json.exists():
+            return
+        records = load_journaled_accounts(legacy_json)[0]
+        seen_emails: set[str] = set()
+        with conn:
+            for username, info in records.items():
+                if not isinstance(info, dict):
+                    continue
+                row = account_row(username, info)
+                email = normalize_email(row[2])
+                if email in seen_emails:
+                    # El índice es único: el correo repetido se queda con la primera cuenta
+                    print(f"Correo duplicado en {legacy_json.name}: se deja sin correo a '{username}'")
+                    row = (*row[:2], "", *row[3:])
+                elif email:
+                    seen_emails.add(email)
+                conn.execute("INSERT OR IGNORE INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            conn.execute("INSERT INTO meta VALUES ('migrated_json', ?)", (str(len(records)),))
+
+    def load(self, username: str) -> dict[str, object] | None:
+        if username not in self.records:
+            row = self.conn.execute(f"SELECT {ACCOUNT_COLUMNS} FROM accounts WHERE username = ?", (username,)).fetchone()
+            self.records[username] = account_info(row) if row is not None else None
+        return self.records[username]
+
+    def __contains__(self, username: str) -> bool:
+        return self.load(username) is not None
+
+    def __getitem__(self, username: str) -> dict[str, object]:
+        info = self.load(username)
+        if info is None:
+            raise KeyError(username)
+        return dict(info)
+
+    def get(self, username: str, default: dict[str, object] | None = None) -> dict[str, object] | None:
+        info = self.load(username)
+        return dict(info) if info is not None else default
+
+    def __setitem__(self, username: str, info: dict[str, object]) -> None:
+        # Misma forma que al leer de la tabla (correo sin espacios, skins como lista)
+        record = account_info(account_row(username, info)[1:])
+        self.records[username] = record
+        self.unsaved.add(username)
+        self.writer.put(username, record)
+
+    def poll(self) -> list[tuple[str, Exception]]:
+        # Desde el bucle de Tk: aplica lo que ha confirmado el escritor y devuelve las
+        # cuentas rechazadas. Una cuenta rechazada vuelve a lo que hay en disco, salvo
+        # que ya tenga otro cambio en cola (ese traerá su propio resultado).
+        failed: list[tuple[str, Exception]] = []
+        while True:
+            try:
+                username, info, exc = self.writer.results.get_nowait()
+            except queue.Empty:
+                return failed
+            latest = self.records.get(username) == info
+            if exc is not None:
+                failed.append((username, exc))
+                if latest:
+                    del self.records[username]
+            if latest:
+                self.unsaved.discard(username)
+
+    def find_by_email(self, email: str) -> str:
+        email = normalize_email(email)
+        if not email:
+            return ""
+        # Primero lo que aún no está en disco; luego el índice del correo
+        for username in sorted(self.unsaved):
+            info = self.records.get(username)
+            if info is not None and normalize_email(info["email"]) == email:
+                return username
+        for (username,) in self.conn.execute("SELECT username FROM accounts WHERE email = ?", (email,)):
+            info = self.load(username)
+            if info is not None and normalize_email(info["email"]) == email:
+                return username
+        return ""
+
+    def scores(self) -> list[tuple[str, int]]:
+        best = dict(self.conn.execute("SELECT username, best_score FROM accounts WHERE best_score > 0"))
+        for username in self.unsaved:
+            info = self.records.get(username)
+            if info is not None:
+                best[username] = int(info["best_score"])
+        return [(user, score) for user, score in best.items() if score > 0]
+
+    def close(self) -> None:
+        self.writer.close()
+        self.poll()
+        self.conn.close()
+
+
+class ProfileWriter(BatchWriter):
+    # Escritor de perfiles sueltos: cada clave del lote es un fichero pequeño
+    name = "profile-writer"
+
+    def write_batch(self, batch: dict[Path, dict[str, object]]) -> None:
+        for path, record in batch.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(path, json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self.writes += 1
+
+
+class ShardedAccountStore:
+    # Un fichero por usuario en profiles/<xx>/<sha1>.json, un índice de correos partido
+    # en 256 ficheros profiles/_email/<xx>.json y otro de récords en profiles/_scores/<xx>.json
+    # (repartido por usuario). Guardar a un jugador reescribe solo su perfil (y el trozo
+    # de un índice si cambia su correo o su récord), y al arrancar no se lee nada: cada
+    # perfil o trozo se carga la primera vez que se necesita.
+    kind = "sharded"
+
+    def __init__(self, root: Path, legacy_json: Path | None = None) -> None:
+        self.root = root
+        self.profiles: dict[str, dict[str, object] | None] = {}
+        self.email_shards: dict[str, dict[str, str]] = {}
+        self.score_shards: dict[str, dict[str, int]] = {}
+        self.writer = ProfileWriter()
+        if legacy_json is not None:
+            self.migrate_json(legacy_json)
+
+    def profile_path(self, username: str) -> Path:
+        digest = hashlib.sha1(username.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def email_shard_key(self, email: str) -> str:
+        return hashlib.sha1(email.encode("utf-8")).hexdigest()[:2]
+
+    def email_shard(self, key: str) -> dict[str, str]:
+        shard = self.email_shards.get(key)
+        if shard is None:
+            data = load_accounts_file(self.root / "_email" / f"{key}.json")
+            shard = self.email_shards[key] = {str(email): str(user) for email, user in data.items()}
+        return shard
+
+    def score_shard_key(self, username: str) -> str:
+        return hashlib.sha1(username.encode("utf-8")).hexdigest()[:2]
+
+    def score_shard(self, key: str) -> dict[str, int]:
+        shard = self.score_shards.get(key)
+        if shard is None:
+            data = load_accounts_file(self.root / "_scores" / f"{key}.json")
+            shard = self.score_shards[key] = {str(user): int(best) for user, best in data.items()}
+        return shard
+
+    def migrate_json(self, legacy_json: Path) -> None:
+        # Migración única y síncrona (al arrancar, antes de abrir la ventana); el JSON queda como copia
+        marker = self.root / ".migrated"
+        if marker.exists() or not legacy_json.exists():
+            return
+        shards: dict[str, dict[str, str]] = {}
+        scores: dict[str, dict[str, int]] = {}
+        for username, info in load_journaled_accounts(legacy_json)[0].items():
+            if not isinstance(info, dict):
+                continue
+            path = self.profile_path(username)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(path, json.dumps({**info, "username": username}, ensure_ascii=False, separators=(",", ":")), durable=False)
+            email = normalize_email(info.get("email", ""))
+            if email:
+                shards.setdefault(self.email_shard_key(email), {}).setdefault(email, username)
+            best = int(info.get("best_score", 0))
+            if best > 0:
+                scores.setdefault(self.score_shard_key(username), {})[username] = best
+        (self.root / "_email").mkdir(parents=True, exist_ok=True)
+        for key, shard in shards.items():
+            atomic_write_text(self.root / "_email" / f"{key}.json", json.dumps(shard, ensure_ascii=False, separators=(",", ":")), durable=False)
+        self.write_score_index(scores)
+        # Un solo sync al final en vez de un fsync por perfil; la marca va después
+        if hasattr(os, "sync"):
+            os.sync()
+        atomic_write_text(marker, legacy_json.name)
+
+    def write_score_index(self, scores: dict[str, dict[str, int]]) -> None:
+        folder = self.root / "_scores"
+        folder.mkdir(parents=True, exist_ok=True)
+        for key, shard in scores.items():
+            atomic_write_text(folder / f"{key}.json", json.dumps(shard, ensure_ascii=False, separators=(",", ":")), durable=False)
+        self.score_shards.update(scores)
+        atomic_write_text(folder / ".complete", "1")
+
+    def get(self, username: str, default: dict[str, object] | None = None) -> dict[str, object] | None:
+        if username not in self.profiles:
+            data = load_accounts_file(self.profile_path(username))
+            # El nombre real va dentro del fichero (el ranking lo necesita al listar perfiles)
+            self.profiles[username] = data if data.pop("username", None) == username else None
+        info = self.profiles[username]
+        return dict(info) if info is not None else default
+
+    def __contains__(self, username: str) -> bool:
+        return self.get(username) is not None
+
+    def __getitem__(self, username: str) -> dict[str, object]:
+        info = self.get(username)
+        if info is None:
+            raise KeyError(username)
+        return info
+
+    def __setitem__(self, username: str, info: dict[str, object]) -> None:
+        old = self.get(username)
+        old_email = normalize_email(old.get("email", "")) if old else ""
+        email = normalize_email(info.get("email", ""))
+        if old_email != email:
+            if old_email:
+                key = self.email_shard_key(old_email)
+                shard = self.email_shard(key)
+                if shard.get(old_email) == username:
+                    del shard[old_email]
+                    self.writer.put(self.root / "_email" / f"{key}.json", shard)
+            if email:
+                key = self.email_shard_key(email)
+                shard = self.email_shard(key)
+                if email not in shard:
+                    shard[email] = username
+                    self.writer.put(self.root / "_email" / f"{key}.json", shard)
+        best = int(info.get("best_score", 0))
+        if best != (int(old.get("best_score", 0)) if old else 0):
+            key = self.score_shard_key(username)
+            shard = self.score_shard(key)
+            if best > 0:
+                shard[username] = best
+            else:
+                shard.pop(username, None)
+            self.writer.put(self.root / "_scores" / f"{key}.json", shard)
+        self.profiles[username] = dict(info)
+        self.writer.put(self.profile_path(username), {**info, "username": username})
+
+    def find_by_email(self, email: str) -> str:
+        normalized = normalize_email(email)
+        if not normalized:
+            return ""
+        return self.email_shard(self.email_shard_key(normalized)).get(normalized, "")
+
+    def scores(self) -> list[tuple[str, int]]:
+        # Para reconstruir el ranking cuando falta su fichero: se leen los trozos del
+        # índice de récords, no los perfiles
+        folder = self.root / "_scores"
+        if not (folder / ".complete").exists():
+            self.build_score_index()
+        keys = {path.stem for path in folder.glob("[0-9a-f][0-9a-f].json")} | self.score_shards.keys()
+        return [item for key in sorted(keys) for item in self.score_shard(key).items()]
+
+    def build_score_index(self) -> None:
+        # Perfiles de antes del índice de récords: se recorren todos una sola vez
+        self.writer.flush()
+        scores: dict[str, dict[str, int]] = {}
+        for path in self.root.glob("[0-9a-f][0-9a-f]/*.json"):
+            data = load_accounts_file(path)
+            best = int(data.get("best_score", 0))
+            if "username" in data and best > 0:
+                username = str(data["username"])
+                scores.setdefault(self.score_shard_key(username), {})[username] = best
+        self.write_score_index(scores)
+
+    def poll(self) -> list[tuple[str, Exception]]:
+        # Sin restricciones entre cuentas en disco: no hay escrituras que se rechacen
+        return []
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def normalize_email(value: object) -> str:
+    return str(value).strip().lower()
+
+
+def account_info(row: tuple) -> dict[str, object]:
+    # Columnas de la tabla (sin el usuario) -> registro como el de los otros almacenes
+    password, email, emilianos, best_score, equipped_skin, owned_skins = row
+    try:
+        owned = json.loads(owned_skins)
+    except json.JSONDecodeError:
+        owned = ["default"]
+    return {
+        "password": password,
+        "email": email,
+        "emilianos": emilianos,
+        "best_score": best_score,
+        "equipped_skin": equipped_skin,
+        "owned_skins": owned if isinstance(owned, list) else ["default"],
+    }
+
+
+def account_row(username: str, info: dict[str, object]) -> tuple:
+    return (
+        username,
+        str(info.get("password", "")),
+        str(info.get("email", "")).strip(),
+        int(info.get("emilianos", 0)),
+        int(info.get("best_score", 0)),
+        str(info.get("equipped_skin", "default")),
+        json.dumps(list(info.get("owned_skins", ["default"])), ensure_ascii=False),
+    )
+
+
+def open_account_store(root: Path) -> JsonAccountStore | SqliteAccountStore | ShardedAccountStore:
+    # DINO_STORAGE=json mantiene el fichero único de siempre y DINO_STORAGE=sharded usa
+    # un fichero por usuario; por defecto, SQLite
+    legacy_json = root / "accounts_data.json"
+    mode = os.environ.get("DINO_STORAGE", "sqlite").lower()
+    if mode == "json":
+        return JsonAccountStore(legacy_json)
+    if mode == "sharded":
+        return ShardedAccountStore(root / "profiles", legacy_json)
+    return SqliteAccountStore(root / "accounts.db", legacy_json)
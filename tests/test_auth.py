@@ -0,0 +1,61 @@
+import time
+
+from auth import AuthWorker, hash_password, verify_password
+
+
+def wait_poll(worker: AuthWorker, done, timeout: float = 10.0) -> None:
+    # poll() es lo que hace el bucle de Tk en cada tick
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        worker.poll()
+        time.sleep(0.01)
+
+
+def test_failed_job_reports_error_and_worker_keeps_going():
+    worker = AuthWorker()
+    results = []
+    errors = []
+
+    def broken(password: str) -> str:
+        raise MemoryError("scrypt sin memoria")
+
+    worker.submit(broken, ("secreta",), results.append, errors.append)
+    worker.submit(hash_password, ("secreta",), results.append, errors.append)
+    wait_poll(worker, lambda: len(results) + len(errors) == 2)
+    assert [type(exc) for exc in errors] == [MemoryError]
+    assert verify_password("secreta", results[0]) == (True, None)
+
+
+def test_callback_error_goes_to_on_error():
+    worker = AuthWorker()
+    errors = []
+
+    def callback(result: object) -> None:
+        raise KeyError("cuenta")
+
+    worker.submit(len, ("abc",), callback, errors.append)
+    wait_poll(worker, lambda: errors)
+    assert [type(exc) for exc in errors] == [KeyError]
+
+
+def test_failing_on_error_never_reaches_the_tk_loop():
+    worker = AuthWorker()
+    unhandled = []
+
+    def callback(result: object) -> None:
+        raise KeyError("cuenta")
+
+    def on_error(exc: Exception) -> None:
+        raise RuntimeError("etiqueta destruida")
+
+    def broken(password: str) -> str:
+        raise MemoryError("scrypt sin memoria")
+
+    worker.submit(len, ("abc",), callback, on_error)
+    worker.submit(broken, ("secreta",), callback, on_error)
+    deadline = time.monotonic() + 10.0
+    while len(unhandled) < 2 and time.monotonic() < deadline:
+        unhandled += worker.poll()
+        time.sleep(0.01)
+    assert [type(exc) for exc in unhandled] == [RuntimeError, RuntimeError]
+    assert worker.thread.is_alive()
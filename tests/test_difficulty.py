@@ -0,0 +1,34 @@
+import json
+import os
+import struct
+import zlib
+
+import difficulty
+
+
+def write_png(path, width: int, height: int) -> None:
+    # Solo la firma y la cabecera IHDR: es lo único que lee png_size
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr)))
+
+
+def test_cactus_sizes_trust_the_manifest_until_the_folder_changes(tmp_path, monkeypatch):
+    cactus = tmp_path / "cactus"
+    cactus.mkdir()
+    write_png(cactus / "a.png", 42, 40)
+    manifest = tmp_path / "cactus_atlas.json"
+    manifest.write_text(json.dumps({"version": 1, "sprites": [{"name": "a.png", "x": 0, "y": 0, "w": 30, "h": 50}]}))
+    monkeypatch.setattr(difficulty, "CACTUS_ASSETS_DIR", cactus)
+    monkeypatch.setattr(difficulty, "ATLAS_MANIFEST", manifest)
+    os.utime(cactus, (1_000, 1_000))
+    os.utime(manifest, (2_000, 2_000))
+    # Manifiesto al día: se usan sus tamaños sin mirar los PNG
+    assert difficulty.cactus_sizes() == [(30, 50)]
+
+    # Un PNG nuevo deja la carpeta más nueva que el manifiesto: se vuelve a los ficheros
+    write_png(cactus / "b.png", 28, 60)
+    os.utime(cactus, (3_000, 3_000))
+    assert difficulty.cactus_sizes() == [(42, 40), (28, 60)]
+
+    manifest.unlink()
+    assert difficulty.cactus_sizes() == [(42, 40), (28, 60)]
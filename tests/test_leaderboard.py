@@ -0,0 +1,39 @@
+from leaderboard import Leaderboard
+
+
+class FakeAccounts:
+    kind = "sqlite"
+
+    def __init__(self, scores: list[tuple[str, int]]) -> None:
+        self.scores_calls = 0
+        self.rows = scores
+
+    def scores(self) -> list[tuple[str, int]]:
+        self.scores_calls += 1
+        return self.rows
+
+
+def test_board_file_survives_without_clean_close(tmp_path):
+    path = tmp_path / "leaderboard.json"
+    accounts = FakeAccounts([("ana", 300), ("beto", 120)])
+    board = Leaderboard.open(path, accounts)
+    board.submit("beto", 500)
+    board.writer.flush()
+    # Sin close(): como si el proceso muriera aquí
+    again = Leaderboard.open(path, accounts)
+    assert accounts.scores_calls == 1
+    assert again.top(2) == [(1, "beto", 500), (2, "ana", 300)]
+    assert path.exists()
+    board.close()
+    again.close()
+
+
+def test_board_from_other_store_is_rebuilt(tmp_path):
+    path = tmp_path / "leaderboard.json"
+    Leaderboard.open(path, FakeAccounts([("ana", 300)])).close()
+    other = FakeAccounts([("carla", 50)])
+    other.kind = "json"
+    board = Leaderboard.open(path, other)
+    assert other.scores_calls == 1
+    assert board.rank("carla") == 1
+    board.close()
@@ -0,0 +1,143 @@
+import base64
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+from email.message import EmailMessage
+
+import pytest
+
+import mailer
+from mailer import Mailer, SmtpConfig
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    # Servidor SMTP mínimo: lo justo para que smtplib haga EHLO, AUTH PLAIN, MAIL, RCPT,
+    # DATA y QUIT. Con drop_data > 0 corta la conexión en vez de aceptar ese DATA.
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self) -> None:
+        server = self.server
+        server.log.append("connect")
+        self.reply("220 localhost ESMTP prueba")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif verb == "AUTH":
+                _, user, password = base64.b64decode(command.split(" ")[2]).split(b"\0")
+                server.log.append(("login", user.decode(), password.decode()))
+                self.reply("235 ok")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 ok")
+            elif verb == "DATA":
+                self.reply("354 adelante")
+                data = b""
+                while not data.endswith(b"\r\n.\r\n"):
+                    chunk = self.rfile.readline()
+                    if not chunk:
+                        return
+                    data += chunk
+                if server.drop_data:
+                    server.drop_data -= 1
+                    server.log.append("drop")
+                    return
+                server.messages.append(message_from_bytes(data[:-5]))
+                self.reply("250 recibido")
+            elif verb == "QUIT":
+                server.log.append("quit")
+                self.reply("221 adiós")
+                return
+            else:
+                self.reply("502 no implementado")
+
+
+class LocalSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self, drop_data: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), SmtpHandler)
+        self.drop_data = drop_data
+        self.messages: list[EmailMessage] = []
+        self.log: list = []
+
+
+@pytest.fixture
+def smtp_server(request):
+    server = LocalSmtpServer(getattr(request, "param", 0))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def local_config(monkeypatch, server: LocalSmtpServer) -> SmtpConfig:
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(server.server_address[1]))
+    monkeypatch.setenv("SMTP_USER", "juego")
+    monkeypatch.setenv("SMTP_PASS", "secreta")
+    monkeypatch.setenv("SMTP_SENDER", "juego@example.com")
+    monkeypatch.setenv("SMTP_STARTTLS", "0")
+    return SmtpConfig.from_env()
+
+
+def message(to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "juego@example.com"
+    msg["To"] = to
+    msg["Subject"] = "Código"
+    msg.set_content("123456")
+    return msg
+
+
+def send_all(mail: Mailer, recipients: list[str], timeout: float = 5.0) -> list[bool]:
+    results: list[bool] = []
+    for to in recipients:
+        mail.send(message(to), results.append)
+    deadline = time.monotonic() + timeout
+    while len(results) < len(recipients) and time.monotonic() < deadline:
+        mail.poll()
+        time.sleep(0.01)
+    return results
+
+
+def test_connection_is_reused_between_mails(monkeypatch, smtp_server):
+    mail = Mailer(local_config(monkeypatch, smtp_server))
+    assert send_all(mail, ["a@example.com", "b@example.com", "c@example.com"]) == [True, True, True]
+    assert [msg["To"] for msg in smtp_server.messages] == ["a@example.com", "b@example.com", "c@example.com"]
+    assert smtp_server.messages[0].get_payload().strip() == "123456"
+    # SMTP_STARTTLS=0: una sola conexión, autenticada sin TLS
+    assert smtp_server.log == ["connect", ("login", "juego", "secreta")]
+    assert mail.connections == 1
+    mail.close()
+
+
+@pytest.mark.parametrize("smtp_server", [1], indirect=True)
+def test_retries_on_a_new_connection_after_a_disconnect(monkeypatch, smtp_server):
+    monkeypatch.setattr(mailer, "RETRY_BACKOFF_S", 0.0)
+    mail = Mailer(local_config(monkeypatch, smtp_server))
+    assert send_all(mail, ["a@example.com", "b@example.com"]) == [True, True]
+    # El primer DATA se pierde con la conexión; el reintento va por una nueva
+    assert [msg["To"] for msg in smtp_server.messages] == ["a@example.com", "b@example.com"]
+    assert smtp_server.log.count("connect") == 2
+    assert smtp_server.log.index("drop") < smtp_server.log.index("connect", 1)
+    assert mail.connections == 2
+    mail.close()
+
+
+def test_close_quits_the_open_connection(monkeypatch, smtp_server):
+    mail = Mailer(local_config(monkeypatch, smtp_server))
+    assert send_all(mail, ["a@example.com"]) == [True]
+    mail.close()
+    assert not mail.thread.is_alive()
+    assert mail.server is None
+    deadline = time.monotonic() + 2.0
+    while smtp_server.log[-1] != "quit" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert smtp_server.log[-1] == "quit"
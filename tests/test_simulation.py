@@ -0,0 +1,58 @@
+from itertools import repeat
+
+from simulation import EVENT_COIN, EVENT_DEATH, KIND_BIRD, KIND_CACTUS, KIND_COIN, Course, CourseEntry, GameSimulation
+
+
+def quiet_sim(width: int) -> GameSimulation:
+    # Sin recorrido: solo aparece lo que el test pone a mano
+    sim = GameSimulation(width, 600)
+    sim.reset(seed=1)
+    sim.course = Course(repeat([]))
+    return sim
+
+
+def run(sim: GameSimulation, steps: int) -> int:
+    events = 0
+    for _ in range(steps):
+        events |= sim.step()
+    return events
+
+
+def test_shrink_keeps_lane_sorted_and_collides():
+    # Un cactus en vuelo desde una ventana ancha y otro aparecido tras estrecharla: el
+    # nuevo queda más cerca del jugador y tiene que ir primero en la lane
+    sim = quiet_sim(1900)
+    sim.spawn(CourseEntry(0, KIND_CACTUS, 0, 0))
+    sim.resize(700, 600)
+    sim.spawn(CourseEntry(0, KIND_CACTUS, 0, 0))
+    xs = [obs.x for obs in sim.cacti]
+    assert xs == sorted(xs) == [720.0, 1920.0]
+
+    events = run(sim, 200)
+    assert events & EVENT_DEATH
+    assert sim.killed_by.x < sim.player_x + sim.player_w
+
+
+def test_shrink_culls_entities_left_behind():
+    # Pájaros altos: no tocan al jugador de pie, solo se mira cuándo salen de la lane
+    sim = quiet_sim(1900)
+    sim.spawn(CourseEntry(0, KIND_BIRD, 210, -1))
+    sim.resize(700, 600)
+    sim.spawn(CourseEntry(0, KIND_BIRD, 210, -1))
+    assert not run(sim, 100) & EVENT_DEATH
+    # El de la ventana estrecha ya ha salido por la izquierda; el otro sigue en pantalla
+    assert [bird.x > 600 for bird in sim.birds] == [True]
+
+
+def test_shrink_collects_nearer_coin():
+    sim = quiet_sim(1900)
+    sim.spawn(CourseEntry(0, KIND_COIN, 44, -1))
+    sim.resize(700, 600)
+    sim.spawn(CourseEntry(0, KIND_COIN, 44, -1))
+    events = 0
+    for _ in range(100):
+        events |= sim.step()
+        if events & EVENT_COIN:
+            break
+    assert events & EVENT_COIN
+    assert [coin.x > 1000 for coin in sim.coins] == [True]
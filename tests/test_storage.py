@@ -0,0 +1,89 @@
+import shutil
+import sqlite3
+
+from storage import ShardedAccountStore, SqliteAccountStore
+
+
+def account(best: int, email: str = "") -> dict[str, object]:
+    return {"password": "", "email": email, "emilianos": 0, "best_score": best, "equipped_skin": "default", "owned_skins": ["default"]}
+
+
+def test_sharded_scores_come_from_the_index(tmp_path):
+    root = tmp_path / "profiles"
+    store = ShardedAccountStore(root)
+    store["ana"] = account(0, "ana@example.com")
+    store["ana"] = account(300, "ana@example.com")
+    store["beto"] = account(120)
+    store["carla"] = account(0)
+    store.close()
+
+    # Sin perfiles en disco el ranking se sigue pudiendo construir: no se leen
+    for folder in root.glob("[0-9a-f][0-9a-f]"):
+        shutil.rmtree(folder)
+    reopened = ShardedAccountStore(root)
+    assert sorted(reopened.scores()) == [("ana", 300), ("beto", 120)]
+    reopened.close()
+
+
+def test_sharded_index_is_built_once_for_old_profiles(tmp_path):
+    root = tmp_path / "profiles"
+    store = ShardedAccountStore(root)
+    store["ana"] = account(300)
+    store["beto"] = account(120)
+    store.close()
+    # Perfiles guardados antes de que existiera el índice de récords
+    shutil.rmtree(root / "_scores")
+
+    store = ShardedAccountStore(root)
+    assert sorted(store.scores()) == [("ana", 300), ("beto", 120)]
+    store["beto"] = account(450)
+    store.close()
+    store = ShardedAccountStore(root)
+    assert sorted(store.scores()) == [("ana", 300), ("beto", 450)]
+    store.close()
+
+
+def test_sqlite_writes_leave_the_caller_thread(tmp_path):
+    path = tmp_path / "accounts.db"
+    store = SqliteAccountStore(path)
+    store["ana"] = account(300, "Ana@Example.com ")
+    # Se lee de memoria al momento; en disco aparece cuando escribe el hilo
+    assert store["ana"]["best_score"] == 300
+    assert store.find_by_email("ana@example.com") == "ana"
+    assert store.scores() == [("ana", 300)]
+    assert store.writer.pending
+    store.close()
+
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("SELECT email, best_score FROM accounts WHERE username = 'ana'").fetchone() == ("Ana@Example.com", 300)
+    conn.close()
+    reopened = SqliteAccountStore(path)
+    # Al abrir no se carga ninguna fila: se piden al consultar
+    assert reopened.records == {}
+    assert reopened.scores() == [("ana", 300)]
+    assert reopened.find_by_email("ANA@example.com") == "ana"
+    assert "beto" not in reopened
+    assert set(reopened.records) == {"ana", "beto"}
+    reopened.close()
+
+
+def test_sqlite_rejected_write_is_reported_and_rolled_back(tmp_path):
+    path = tmp_path / "accounts.db"
+    store = SqliteAccountStore(path)
+    store["ana"] = account(300, "ana@example.com")
+    store.writer.flush()
+    assert store.poll() == []
+    assert not store.unsaved
+
+    # Dos cambios del mismo lote piden el mismo correo: el índice único rechaza el segundo
+    store["beto"] = account(120, "beto@example.com")
+    store["ana"] = account(500, "beto@example.com")
+    store.writer.flush()
+    failed = store.poll()
+    assert [(user, type(exc)) for user, exc in failed] == [("ana", sqlite3.IntegrityError)]
+    # La cuenta rechazada vuelve a lo que hay en disco
+    assert store["ana"]["best_score"] == 300
+    assert store.find_by_email("ana@example.com") == "ana"
+    assert store.find_by_email("beto@example.com") == "beto"
+    assert not store.unsaved
+    store.close()